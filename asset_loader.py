@@ -0,0 +1,77 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+import pygame as pg
+from sprite_cache import SpriteCache
+
+class AssetLoader:
+    """Decodes the sprite folder on a thread pool; finished images are converted for the display on the main thread"""
+    def __init__(self, file_path: str = "assets/sprites/", max_workers: int = 4):
+        self.file_path = file_path
+        self.max_workers = max_workers
+        self.executor: ThreadPoolExecutor | None = None
+        self.pending: dict[str, Future] = {}  # sprite name -> decode job
+        self.sprites: dict[str, pg.Surface] = {}
+        self.total = 0
+        self.failed = 0
+        self.sprite_cache = SpriteCache(file_path)
+
+    def start(self):
+        if not os.path.exists(self.file_path):
+            return
+        cached_sprites = self.sprite_cache.load()
+        if cached_sprites is not None:
+            self.sprites = cached_sprites
+            self.total = len(cached_sprites)
+            return
+        file_names = sorted(file_name for file_name in os.listdir(self.file_path)
+                            if file_name.endswith(".png") and not file_name.startswith("."))
+        self.total = len(file_names)
+        if not file_names:
+            return
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asset-loader")
+        for file_name in file_names:
+            # pygame releases the GIL while it reads and decodes the file
+            self.pending[file_name[:-4]] = self.executor.submit(pg.image.load, os.path.join(self.file_path, file_name))
+
+    def poll(self, max_conversions: int = 16) -> float:
+        """Convert up to `max_conversions` decoded images and return the fraction of sprites done"""
+        conversions = 0
+        for sprite_name, future in list(self.pending.items()):
+            if conversions >= max_conversions:
+                break
+            if not future.done():
+                continue
+            del self.pending[sprite_name]
+            conversions += 1
+            try:
+                # convert_alpha needs the display, which only the main thread may touch
+                self.sprites[sprite_name] = future.result().convert_alpha()
+            except Exception as e:
+                self.failed += 1
+                print(f"Failed to load sprite '{sprite_name}.png': {e}")
+        if self.is_done() and self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            if self.sprites:
+                self.sprite_cache.write(self.sprites)
+        return self.get_progress()
+
+    def finish(self):
+        """Block until every sprite is decoded and converted"""
+        for future in list(self.pending.values()):
+            future.exception()  # Waits without raising; poll reports the failures
+        self.poll(max_conversions=len(self.pending))
+
+    def get_progress(self) -> float:
+        if self.total == 0:
+            return 1.0
+        return (self.total - len(self.pending)) / self.total
+
+    def is_done(self) -> bool:
+        return not self.pending
+
+    def cancel(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.pending.clear()
@@ -0,0 +1,133 @@
+import headless  # sets the SDL dummy drivers before pygame is initialised
+
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.scenarios import MAP_TILES, SCENARIOS, Scenario, build_world
+from game_state import GameState
+from headless import HeadlessRunner
+from input_source import VirtualInput
+from play_state import PlayState
+from profiler import SystemProfiler
+from world.terrain_generator import TerrainGenerator
+
+def get_scenario_map(scenario: Scenario, map_dir: str) -> str:
+    """The scenario's generated map, kept out of assets/maps so a benchmark never replaces the player's map"""
+    path = os.path.join(map_dir, f"map_{scenario.seed}.bin")
+    if not os.path.exists(path):
+        TerrainGenerator(scenario.seed).generate_file(path, MAP_TILES, MAP_TILES)
+    return path
+
+def create_runner(scenario: Scenario, map_dir: str) -> HeadlessRunner:
+    # Seed before entering so workers and factories draw the same numbers every run
+    random.seed(scenario.seed)
+    state = PlayState()
+    state.random_seed = scenario.seed
+    state.map_path = get_scenario_map(scenario, map_dir)
+    runner = HeadlessRunner(state, input_source=VirtualInput())
+    build_world(runner.state, scenario, random.Random(scenario.seed))
+    return runner
+
+def run_scenario(scenario: Scenario, map_dir: str, measure_memory: bool = True) -> dict:
+    profiler = SystemProfiler(window=scenario.ticks)
+    GameState.profiler = profiler
+    runner = create_runner(scenario, map_dir)
+    start = time.perf_counter()
+    for _ in range(scenario.ticks):
+        runner.tick()
+        profiler.end_frame()
+    elapsed = time.perf_counter() - start
+    entity_count = len(runner.state.entities)
+    runner.close()
+    GameState.profiler = None
+
+    systems = {}
+    for (system_name, phase), total in sorted(profiler.totals.items()):
+        p50, p95, p99 = profiler.get_percentiles((system_name, phase))
+        systems[f"{system_name}.{phase}"] = {
+            "total_ms": round(total / 1_000_000, 3),
+            "mean_ms": round(total / 1_000_000 / scenario.ticks, 4),
+            "p50_ms": round(p50, 4),
+            "p95_ms": round(p95, 4),
+            "p99_ms": round(p99, 4),
+        }
+
+    result = {
+        "scenario": scenario.to_dict(),
+        "seconds": round(elapsed, 4),
+        "ticks_per_second": round(scenario.ticks / elapsed, 2),
+        "entities": entity_count,
+        "systems": systems,
+    }
+    if measure_memory:
+        # Separate pass: tracemalloc slows everything down and would skew the timings above
+        tracemalloc.start()
+        runner = create_runner(scenario, map_dir)
+        runner.run(scenario.ticks)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        runner.close()
+        result["peak_memory_mb"] = round(peak / (1024 * 1024), 2)
+    return result
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, result in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        minimum = previous["ticks_per_second"] * (1 - threshold)
+        if result["ticks_per_second"] < minimum:
+            regressions.append(f"{name}: {result['ticks_per_second']} ticks/s < {minimum:.2f} "
+                               f"(baseline {previous['ticks_per_second']}, commit {baseline.get('commit')})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the headless benchmark scenarios (from the repository root: python -m benchmarks.run_benchmarks)")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help=f"scenarios to run ({', '.join(SCENARIOS)})")
+    parser.add_argument("--ticks", type=int, help="override the number of ticks per scenario")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed ticks/s drop against the baseline (0.10 = 10%%)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    args = parser.parse_args()
+
+    results = {"commit": get_commit(), "python": platform.python_version(), "scenarios": {}}
+    with tempfile.TemporaryDirectory(prefix="benchmark-maps-", ignore_cleanup_errors=True) as map_dir:
+        for name in args.scenarios:
+            scenario = copy.copy(SCENARIOS[name])  # --ticks must not change the shared definitions
+            if args.ticks:
+                scenario.ticks = args.ticks
+            result = run_scenario(scenario, map_dir, measure_memory=not args.no_memory)
+            results["scenarios"][name] = result
+            print(f"{name:<10} {result['ticks_per_second']:>9.1f} ticks/s  {result['entities']} entities  "
+                  f"peak {result.get('peak_memory_mb', '-')} MB")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
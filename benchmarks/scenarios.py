@@ -0,0 +1,67 @@
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from play_state import PlayState
+
+TILE_SIZE = 32
+MAP_TILES = 100  # the benchmark worlds use the default 100x100 map
+RESOURCE_TYPES = ["wood", "stone", "water", "food"]
+
+class Scenario:
+    def __init__(self, name: str, enemies: int = 0, turrets_per_type: int = 0, workers: int = 0,
+                 resources: int = 0, ticks: int = 600, seed: int = 1234):
+        self.name = name
+        self.enemies = enemies
+        self.turrets_per_type = turrets_per_type
+        self.workers = workers
+        self.resources = resources
+        self.ticks = ticks
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        return {
+            "enemies": self.enemies,
+            "turrets_per_type": self.turrets_per_type,
+            "workers": self.workers,
+            "resources": self.resources,
+            "ticks": self.ticks,
+            "seed": self.seed,
+        }
+
+SCENARIOS: dict[str, Scenario] = {
+    "idle": Scenario("idle"),
+    "combat": Scenario("combat", enemies=200, turrets_per_type=10),
+    "economy": Scenario("economy", workers=50, resources=200),
+    "stress": Scenario("stress", enemies=500, turrets_per_type=25, workers=100, resources=400),
+}
+
+def random_position(rng: random.Random, size: int = TILE_SIZE) -> tuple[int, int]:
+    limit = MAP_TILES * TILE_SIZE - size
+    return (rng.randint(0, limit), rng.randint(0, limit))
+
+def build_world(state: 'PlayState', scenario: Scenario, rng: random.Random):
+    """Populate an entered PlayState with the scenario's enemies, turrets, workers and resources"""
+    state.entity_factory.spawn_many("Enemy", [random_position(rng) for _ in range(scenario.enemies)])
+
+    turret_placement = state.systems["TurretPlacementSystem"]
+    turret_types = list(state.systems["TurretAutoFiringSystem"].turret_configs)
+    grid_size = turret_placement.grid_size
+    for turret_type in turret_types:
+        for _ in range(scenario.turrets_per_type):
+            x, y = random_position(rng, grid_size)
+            turret_placement.create_turret(turret_type, (x // grid_size) * grid_size, (y // grid_size) * grid_size)
+
+    state.entity_factory.spawn_many("Worker", [random_position(rng, 64) for _ in range(scenario.workers)])
+
+    # Resources go where the game would spawn them, so they reserve their cells and never overlap
+    resource_generation = state.systems["RandomResourceGenerationSystem"]
+    spawn_service = resource_generation.spawn_service
+    for i in range(scenario.resources):
+        resource_type = RESOURCE_TYPES[i % len(RESOURCE_TYPES)]
+        cell = spawn_service.sample_for_resource(resource_type)
+        if cell is None:
+            break
+        resource = resource_generation.resource_factory.create_resource(resource_type, spawn_service.cell_to_world(cell))
+        if resource is not None:
+            state.add_entity(resource)
@@ -2,6 +2,12 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 160
 SECOND = 1000  # milliseconds in a second
+SIMULATION_RATE = 60  # simulation steps per second, independent of the display FPS
+SIMULATION_STEP = 1 / SIMULATION_RATE  # seconds per simulation step
+MAX_FRAME_TIME = 0.25  # seconds, caps catch-up steps after a long frame
+PARALLEL_SYSTEMS = False  # run non-conflicting system updates on a thread pool (only pays off for GIL-releasing systems)
+SYSTEM_THREADS = 4
+PROFILER_CSV_PATH = None  # e.g. "profile.csv" to write per-frame system timings (F3 toggles the overlay)
 
 BACKGROUND_COLOR = (0, 0, 0)  # Black
 PAUSED_BACKGROUND = (0, 0, 0, 170) # Black-Transparent
\ No newline at end of file
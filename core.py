@@ -1,33 +1,106 @@
+import argparse
+import random
+import time
 import pygame as pg
 from config import *
 
 from state_manager import StateManager
 from game_state import GameState
-from play_state import PlayState
+from loading_state import LoadingState
+from profiler import SystemProfiler
+from replay import MARKER_STATE_CHANGE, InputRecorder, InputReplayer
+
+parser = argparse.ArgumentParser(description="Fungineer")
+parser.add_argument("--seed", type=int, help="seed for every system's random numbers")
+parser.add_argument("--record", help="record input and frame times to this binary log")
+parser.add_argument("--replay", help="replay a log written with --record")
+args = parser.parse_args()
+
+replayer = InputReplayer(args.replay) if args.replay else None
+GameState.random_seed = replayer.seed if replayer else args.seed
+if args.record and GameState.random_seed is None:
+    # A replay can only rebuild the same world from a concrete seed, so recording always picks one
+    GameState.random_seed = random.SystemRandom().getrandbits(32)
+    print(f"Recording with seed {GameState.random_seed}")
+if replayer:
+    GameState.input_source = replayer.input_source
+recorder = InputRecorder(args.record, GameState.random_seed) if args.record else None
 
 pg.init()
 
 is_running = [True]
 screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 clock = pg.time.Clock()
-state_manager = StateManager(is_running, PlayState())
+accumulator = [0.0]  # seconds of real time not yet simulated
+profiler = SystemProfiler(csv_path=PROFILER_CSV_PATH)
+GameState.profiler = profiler
+# Recordings and replays wait for the assets, so PlayState starts on the same frame every time
+state_manager = StateManager(is_running, LoadingState(wait_for_assets=recorder is not None or replayer is not None))
+
+def read_frame_input() -> tuple[float, list]:
+    """Returns this frame's dt and events, from the replay log when replaying"""
+    if replayer is not None:
+        # Keep the window responsive; only a real quit interrupts a replay
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                is_running[0] = False
+        frame = replayer.next_frame()
+        clock.tick()  # Unlimited, a replay runs as fast as the build allows
+        if frame is None:
+            is_running[0] = False
+            return 0.0, []
+        return frame.dt, frame.events
 
-def handle_events():
-    for event in pg.event.get():
+    frame_time = min(clock.tick(FPS) / SECOND, MAX_FRAME_TIME)
+    events = pg.event.get()
+    if recorder is not None:
+        recorder.record_frame(frame_time, events, pg.mouse.get_pos(), pg.mouse.get_pressed())
+    return frame_time, events
+
+def handle_events(events):
+    for event in events:
+        profiler.handle_event(event)
         state_manager.handle_event(event)
 
-def update():
-    dt = clock.tick(FPS) / SECOND
-    state_manager.update(dt)
+def update(frame_time):
+    previous_state = state_manager.current_state
+    accumulator[0] += frame_time
+    # Run the simulation in fixed steps; rendering interpolates whatever is left over
+    while accumulator[0] >= SIMULATION_STEP:
+        state_manager.update(SIMULATION_STEP)
+        accumulator[0] -= SIMULATION_STEP
+    state_manager.set_interpolation_alpha(accumulator[0] / SIMULATION_STEP)
+    check_state_change(state_manager.current_state is not previous_state)
+
+def check_state_change(changed: bool):
+    """Marks state handovers in the log, and warns when a replay hands over on another frame than the recording"""
+    if recorder is not None and changed:
+        recorder.record_marker(MARKER_STATE_CHANGE)
+    if replayer is not None:
+        recorded = MARKER_STATE_CHANGE in replayer.read_markers()
+        if recorded != changed:
+            print(f"Replay diverged at frame {replayer.frame_count}: "
+                  f"state change {'recorded but not replayed' if recorded else 'replayed but not recorded'}")
 
 def render():
     screen.fill(BACKGROUND_COLOR)
     state_manager.render(screen)
+    profiler.render(screen, state_manager.current_state.entities)
     pg.display.flip()
 
+start_time = time.perf_counter()
 while is_running[0]:
-    handle_events()
-    update()
+    frame_time, events = read_frame_input()
+    handle_events(events)
+    update(frame_time)
     render()
+    profiler.end_frame()
 
-pg.quit()
\ No newline at end of file
+if recorder is not None:
+    recorder.close()
+if replayer is not None:
+    elapsed = time.perf_counter() - start_time
+    print(f"Replayed {replayer.frame_count} frames in {elapsed:.2f}s "
+          f"({elapsed * 1000 / max(1, replayer.frame_count):.2f} ms per frame)")
+profiler.close()
+pg.quit()
@@ -0,0 +1,61 @@
+from spatial_index import KDTreeIndex
+
+class HarvestJob:
+    """A resource waiting to be harvested and the worker that reserved it"""
+    def __init__(self, resource, position: tuple[float, float]):
+        self.resource = resource
+        self.position = position
+        self.worker = None
+
+class JobBoard:
+    """Resources post harvest jobs, idle workers claim the nearest open one and hold it until it is done"""
+    def __init__(self):
+        self.jobs: dict = {}  # resource entity -> HarvestJob
+        self.open_jobs: dict = {}  # resource entity -> HarvestJob, unclaimed only (insertion ordered)
+        self.claims: dict = {}  # worker entity -> HarvestJob
+        self.index = KDTreeIndex()  # every job by position; claimed ones are skipped at query time
+
+    def post(self, resource, position: tuple[float, float]):
+        if resource in self.jobs:
+            return
+        job = HarvestJob(resource, position)
+        self.jobs[resource] = job
+        self.open_jobs[resource] = job
+        self.index.insert(job, position[0], position[1])
+
+    def cancel(self, resource):
+        """Remove the job for a depleted resource and return the worker that had claimed it, if any"""
+        job = self.jobs.pop(resource, None)
+        if job is None:
+            return None
+        self.open_jobs.pop(resource, None)
+        self.index.remove(job)
+        if job.worker is not None:
+            self.claims.pop(job.worker, None)
+        return job.worker
+
+    def release(self, worker):
+        """Give a worker's job back to the board"""
+        job = self.claims.pop(worker, None)
+        if job is not None:
+            job.worker = None
+            self.open_jobs[job.resource] = job
+
+    def claim_nearest(self, worker, position: tuple[float, float]) -> HarvestJob | None:
+        job = self.find_nearest_open_job(position)
+        if job is None:
+            return None
+        job.worker = worker
+        del self.open_jobs[job.resource]
+        self.claims[worker] = job
+        return job
+
+    def find_nearest_open_job(self, position: tuple[float, float]) -> HarvestJob | None:
+        if not self.open_jobs:
+            return None
+        nearest = self.index.nearest(position[0], position[1], predicate=lambda job: job.worker is None)
+        return nearest[0] if nearest else None
+
+    def get_claim(self, worker):
+        job = self.claims.get(worker)
+        return job.resource if job is not None else None
@@ -17,6 +17,9 @@ class PositionComponent(Component):
         super().__init__()
         self.x: float = x
         self.y: float = y
+        # Position at the start of the current simulation step, used for render interpolation
+        self.previous_x: float = x
+        self.previous_y: float = y
 
 class VelocityComponent(Component):
     def __init__(self, vx:float=0, vy:float=0):
@@ -100,10 +103,11 @@ class TextComponent(Component):
         self.text = text
 
 class CollisionComponent(Component):
-    def __init__(self, plane=0):
+    def __init__(self, plane=0, is_static: bool | None = None):
         super().__init__()
         self.is_colliding = False
         self.plane = plane
+        self.is_static = is_static  # None = static unless the entity has a VelocityComponent
 
 class SpawnerComponent(Component):
     def __init__(self, spawn_rate: float=5.0, enemy_type: list[str]=["BasicEnemy"]):
@@ -139,6 +143,13 @@ class WorkerComponent(Component):
         self.carrying_capacity = 100
         self.current_load = 0
         
+class PathComponent(Component):
+    def __init__(self):
+        super().__init__()
+        self.path: list[tuple[int, int]] = []  # cells to walk through, shared with the path cache
+        self.path_index = 0
+        self.goal_cell: tuple[int, int] | None = None
+
 class AnimatedSpriteComponent(Component):
     def __init__(self, frames: list[pg.Surface], frame_duration: float):
         super().__init__()
@@ -185,6 +196,40 @@ class System:
     def __init__(self, state: GameState):
         self.state = state
         self.required_components = []
+        # Component types (plus 'StateData', 'ResourceData', ... for shared state) touched by update().
+        # Spawning or removing entities counts as writing their identifying component, e.g. 'DamageComponent' for bullets.
+        # None means undeclared, and the scheduler will never run the system alongside another one.
+        self.reads: list[str] | None = None
+        self.writes: list[str] | None = None
+        # Scheduling (see is_due): run every `frame_interval` steps and at most once per `update_interval` seconds
+        self.frame_interval: int = 1
+        self.update_interval: float = 0.0
+        self.frames_since_update = 0
+        self.time_since_update = 0.0
+        # Time slicing (see get_time_slice): process 1/time_slices of the entities per update
+        self.time_slices: int = 1
+        self.current_slice = 0
+        
+    # Scheduling Methods
+    def is_due(self, dt) -> bool:
+        self.frames_since_update += 1
+        self.time_since_update += dt
+        if self.frames_since_update < self.frame_interval:
+            return False
+        return self.time_since_update >= self.update_interval - 1e-9
+
+    def consume_elapsed_time(self) -> float:
+        elapsed = self.time_since_update
+        self.frames_since_update = 0
+        self.time_since_update = 0.0
+        return elapsed
+
+    def get_time_slice(self, entities: list) -> list:
+        if self.time_slices <= 1:
+            return entities
+        entities_slice = entities[self.current_slice::self.time_slices]
+        self.current_slice = (self.current_slice + 1) % self.time_slices
+        return entities_slice
         
     # Error Handling Methods
     def _check_entity(self, entity):
@@ -222,6 +267,13 @@ class System:
             else:
                 return "up"
     
+    # Input Accessor Methods (read through the state's input source so headless runs can script them)
+    def get_mouse_position(self) -> tuple[int, int]:
+        return self.state.input_source.get_mouse_position()
+
+    def get_mouse_buttons(self) -> tuple[bool, bool, bool]:
+        return self.state.input_source.get_mouse_buttons()
+
     # Component Accessor Methods (Getters For Components From Entity)
     def get_position(self, entity) -> tuple[float, float]:
         position_component = cast(PositionComponent, entity.get_component("PositionComponent"))
@@ -229,12 +281,28 @@ class System:
         position = (position_component.x, position_component.y)
         return position
 
+    def get_render_position(self, entity) -> tuple[float, float]:
+        position_component = cast(PositionComponent, entity.get_component("PositionComponent"))
+        self.check_for_none(entity, position_component)
+        if not entity.has_components(['VelocityComponent']):
+            return (position_component.x, position_component.y)
+        # Blend between the last two simulation steps so motion stays smooth between steps
+        alpha = self.state.interpolation_alpha
+        x = position_component.previous_x + (position_component.x - position_component.previous_x) * alpha
+        y = position_component.previous_y + (position_component.y - position_component.previous_y) * alpha
+        return (x, y)
+
     def get_size(self, entity) -> tuple[float, float]:
         size_component = cast(SizeComponent, entity.get_component("SizeComponent"))
         self.check_for_none(entity, size_component)
         size = (size_component.width, size_component.height)
         return size
 
+    def get_center(self, entity) -> tuple[float, float]:
+        position = self.get_position(entity)
+        size = self.get_size(entity)
+        return (position[0] + size[0] / 2, position[1] + size[1] / 2)
+
     def get_rect(self, entity) -> pg.Rect:
         position_component = cast(PositionComponent, entity.get_component("PositionComponent"))
         size_component = cast(SizeComponent, entity.get_component("SizeComponent"))
@@ -309,11 +377,24 @@ class System:
         self.check_for_none(entity, collision_component)
         return collision_component.plane
     
+    def get_collision_is_static(self, entity) -> bool:
+        collision_component = cast(CollisionComponent, entity.get_component("CollisionComponent"))
+        self.check_for_none(entity, collision_component)
+        if collision_component.is_static is None:
+            return not entity.has_components(['VelocityComponent'])
+        return collision_component.is_static
+    
     def get_collition_status(self, entity) -> bool:
         collision_component = cast(CollisionComponent, entity.get_component("CollisionComponent"))
         self.check_for_none(entity, collision_component)
         return collision_component.is_colliding
     
+    def get_collision_contacts(self, entity) -> list['Entity']:
+        return self.state.collision_contacts.get(entity, [])
+    
+    def is_touching(self, entity, other_entity) -> bool:
+        return other_entity in self.get_collision_contacts(entity)
+    
     def get_tile_type(self, entity) -> int:
         tile_component = cast(TileComponent, entity.get_component("TileComponent"))
         self.check_for_none(entity, tile_component)
@@ -463,3 +544,17 @@ class System:
     
     def render(self, screen):
         pass
+
+    # Entity Lifecycle Hooks (called by GameState.add_entity / GameState.remove_entity)
+    def on_entity_added(self, entity):
+        pass
+
+    def on_entity_removed(self, entity):
+        pass
+
+    # Called by GameState.unload_entity / GameState.restore_entity when a streamed-out entity lives on as record `record_id`
+    def on_entity_unloaded(self, entity, record_id: int):
+        self.on_entity_removed(entity)
+
+    def on_entity_restored(self, entity, record_id: int):
+        self.on_entity_added(entity)
@@ -0,0 +1,97 @@
+import copy
+import pygame as pg
+import ecs
+from ecs import AnimatedSpriteComponent, Component, Entity, PositionComponent, SizeComponent, SpriteComponent
+
+WORKER_FRAMES = [f"worker_{i:03d}" for i in range(24)]
+TURRET_TYPES = ["Basic", "Rapid", "Heavy", "Sniper"]
+TREE_TYPES = {"Oak": "TREE_001", "Pine": "TREE_002", "Birch": "TREE_003", "Maple": "TREE_004"}
+
+# Components every EntityFactory unit has besides position, sprite and size (component class name -> arguments)
+UNIT_COMPONENTS = {"VelocityComponent": {}, "HealthComponent": {"health": 100}, "CollisionComponent": {"plane": 0}}
+
+def get_turret_definition(turret_type: str) -> dict:
+    return {"components": {"TowerComponent": {"TowerType": turret_type}, "HealthComponent": {"health": 100}}}
+
+def get_resource_definition(resource_type: str, sprite_name: str, extra_components: dict | None = None) -> dict:
+    components = {
+        "ResourceComponent": {"resource_type": resource_type, "resource_amount": 100},
+        "CollisionComponent": {"plane": 0},
+        "HealthComponent": {"health": 100},
+    }
+    return {"sprites": [sprite_name], "size": (32, 32), "components": {**components, **(extra_components or {})}}
+
+PREFAB_DEFINITIONS: dict[str, dict] = {
+    "Player": {"sprites": ["player_004"], "size": (64, 64), "components": {**UNIT_COMPONENTS, "ControllableComponent": {}}},
+    "Worker": {"sprites": WORKER_FRAMES, "size": (64, 64), "components": {**UNIT_COMPONENTS, "WorkerComponent": {}}},
+    "Villager": {"sprites": WORKER_FRAMES, "size": (64, 64), "components": {**UNIT_COMPONENTS, "WorkerComponent": {}}},
+    "Enemy": {"sprites": ["enemy_000"], "size": (32, 32),
+              "components": {**UNIT_COMPONENTS, "EnemyComponent": {"enemy_type": 0}}},
+    "Factory": {"size": (64, 64), "components": {**UNIT_COMPONENTS, "FactoryComponent": {"factory_type": "GenericFactory"}}},
+    "Spawner": {"size": (64, 64),
+                "components": {**UNIT_COMPONENTS, "SpawnerComponent": {"spawn_rate": 5.0, "enemy_type": ["BasicEnemy"]}}},
+    **{f"Turret_{turret_type}": get_turret_definition(turret_type) for turret_type in TURRET_TYPES},
+    **{f"Tree_{tree_type}": get_resource_definition("tree", sprite_name, {"TreeComponent": {"tree_type": tree_type}})
+       for tree_type, sprite_name in TREE_TYPES.items()},
+    **{f"Resource_{resource_type}": get_resource_definition(resource_type, resource_type)
+       for resource_type in ["stone", "water", "food", "wood"]},
+}
+# Entity types without a definition still get the unit components, as EntityFactory always gave them
+DEFAULT_DEFINITION = {"components": UNIT_COMPONENTS}
+
+def resolve_components(component_arguments: dict[str, dict]) -> list[Component]:
+    return [getattr(ecs, component_name)(**arguments) for component_name, arguments in component_arguments.items()]
+
+class Prefab:
+    """Prototype components for one kind of entity; spawning copies them instead of rebuilding sprites and layout"""
+    def __init__(self, name: str, sprites: list[pg.Surface], size: tuple[int, int], components: list[Component],
+                 frame_duration: float = 0.2):
+        self.name = name
+        self.size = size
+        self.prototypes: list[Component] = []
+        if len(sprites) == 1:
+            self.prototypes.append(SpriteComponent(sprite=sprites[0]))
+        elif sprites:
+            # Every instance shares the frame list; only the animation clock is per entity
+            self.prototypes.append(AnimatedSpriteComponent(frames=sprites, frame_duration=frame_duration))
+        self.prototypes.append(SizeComponent(width=size[0], height=size[1]))
+        self.prototypes.extend(components)
+
+    @classmethod
+    def from_definition(cls, name: str, definition: dict, sprites: list[pg.Surface], size: tuple[int, int]) -> 'Prefab':
+        return cls(name, sprites, size, resolve_components(definition.get("components", {})),
+                   definition.get("frame_duration", 0.2))
+
+    def instantiate(self, entity_name: str, position: tuple[float, float]) -> Entity:
+        entity = Entity(entity_name)
+        entity.add_component(PositionComponent(x=position[0], y=position[1]))
+        for prototype in self.prototypes:
+            entity.add_component(copy.copy(prototype))
+        return entity
+
+class PrefabLibrary:
+    """Prefab definitions resolved against the sprite registry once per (prefab, sprites, size)"""
+    def __init__(self, sprite_manager, definitions: dict[str, dict] = PREFAB_DEFINITIONS):
+        self.sprite_manager = sprite_manager
+        self.definitions = definitions
+        self.prefabs: dict[tuple, Prefab] = {}
+        self.missing_sprite = pg.Surface((32, 32))
+        self.missing_sprite.fill((255, 0, 255))
+
+    def get_prefab(self, prefab_name: str, sprite_names: list[str] | str | None = None,
+                   size: tuple[int, int] | None = None, default_definition: dict = DEFAULT_DEFINITION) -> Prefab:
+        """The named prefab, optionally with other sprites or another size than its definition's"""
+        definition = self.definitions.get(prefab_name, default_definition)
+        if isinstance(sprite_names, str):
+            sprite_names = [sprite_names]
+        sprite_names = tuple(sprite_names if sprite_names is not None else definition.get("sprites", ()))
+        size = tuple(size if size is not None else definition.get("size", (64, 64)))
+        key = (prefab_name, sprite_names, size)
+        prefab = self.prefabs.get(key)
+        if prefab is None:
+            sprites = [self.sprite_manager.get_sprite_variant(sprite_name, size) for sprite_name in sprite_names]
+            if not sprites:
+                sprites = [self.missing_sprite]
+            prefab = Prefab.from_definition(prefab_name, definition, sprites, size)
+            self.prefabs[key] = prefab
+        return prefab
@@ -0,0 +1,141 @@
+import random
+import numpy as np
+from map import BLOCKING_TILES, TILE_GRASS, TILE_DIRT, TILE_STONE
+
+# Tile types each resource prefers to spawn on; any free walkable tile is used once those run out
+RESOURCE_TILES: dict[str, set[int]] = {
+    "wood": {TILE_GRASS},
+    "food": {TILE_GRASS},
+    "stone": {TILE_STONE, TILE_DIRT},
+    "water": {TILE_GRASS, TILE_DIRT},
+}
+
+class SpawnService:
+    """Free map cells grouped by tile type, so a valid spawn cell is drawn in O(1) instead of by trial and error"""
+    def __init__(self, map_data, tile_size: int, seed: int | None = None, min_spacing: int = 1,
+                 blocking_tiles: set[int] = BLOCKING_TILES, active: bool = True):
+        self.tile_size = tile_size
+        self.min_spacing = min_spacing  # cells kept clear around every spawned resource (Poisson-disk radius)
+        self.random = random.Random(seed)
+        self.tiles = np.asarray(map_data)
+        self.height = len(self.tiles)
+        self.width = len(self.tiles[0]) if self.height else 0
+        self.spawnable = ~np.isin(self.tiles, list(blocking_tiles)).ravel()
+        # Cells spawns may use at all, e.g. only the loaded part of a streamed map (see set_active)
+        self.active = np.full(self.width * self.height, active, dtype=bool)
+        # tile type -> free cell indices (y * width + x), plus each cell's slot in its list so removal
+        # is a swap with the last one; -1 marks cells that aren't free
+        self.free_cells: dict[int, list[int]] = {}
+        self.free_slots = np.full(self.width * self.height, -1, dtype=np.int64)
+        self.blockers: dict[tuple[int, int], int] = {}  # cell -> entities or spacing disks covering it
+        flat_tiles = self.tiles.ravel()
+        for tile_type in np.unique(flat_tiles[self.spawnable]).tolist():
+            indices = np.flatnonzero(self.spawnable & self.active & (flat_tiles == tile_type))
+            self.free_cells[tile_type] = indices.tolist()
+            self.free_slots[indices] = np.arange(len(indices))
+        self.free_count = int((self.spawnable & self.active).sum())
+        self.spacing_offsets = self.get_disk_offsets(min_spacing)
+
+    def get_disk_offsets(self, radius: int) -> list[tuple[int, int]]:
+        return [(dx, dy) for dy in range(-radius, radius + 1) for dx in range(-radius, radius + 1)
+                if dx * dx + dy * dy <= radius * radius]
+
+    def in_bounds(self, cell: tuple[int, int]) -> bool:
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def add_free_cell(self, cell: tuple[int, int]):
+        index = cell[1] * self.width + cell[0]
+        if not self.spawnable[index] or not self.active[index] or self.free_slots[index] >= 0:
+            return
+        cells = self.free_cells.setdefault(int(self.tiles[cell[1], cell[0]]), [])
+        self.free_slots[index] = len(cells)
+        cells.append(index)
+        self.free_count += 1
+
+    def remove_free_cell(self, cell: tuple[int, int]):
+        index = cell[1] * self.width + cell[0]
+        slot = int(self.free_slots[index])
+        if slot < 0:
+            return
+        cells = self.free_cells[int(self.tiles[cell[1], cell[0]])]
+        last_index = cells.pop()
+        if last_index != index:
+            cells[slot] = last_index
+            self.free_slots[last_index] = slot
+        self.free_slots[index] = -1
+        self.free_count -= 1
+
+    def set_active(self, cell: tuple[int, int], active: bool):
+        if not self.in_bounds(cell):
+            return
+        index = cell[1] * self.width + cell[0]
+        if self.active[index] == active:
+            return
+        self.active[index] = active
+        if not active:
+            self.remove_free_cell(cell)
+        elif cell not in self.blockers:
+            self.add_free_cell(cell)
+
+    def get_free_count(self, tile_types: set[int] | None = None) -> int:
+        if tile_types is None:
+            return self.free_count
+        return sum(len(self.free_cells.get(tile_type, ())) for tile_type in tile_types)
+
+    def sample(self, tile_types: set[int] | None = None) -> tuple[int, int] | None:
+        """A uniformly random free cell on one of `tile_types` (any tile type when None)"""
+        groups = [cells for tile_type, cells in self.free_cells.items()
+                  if cells and (tile_types is None or tile_type in tile_types)]
+        total = sum(len(cells) for cells in groups)
+        if total == 0:
+            return None
+        choice = self.random.randrange(total)
+        for cells in groups:
+            if choice < len(cells):
+                return (cells[choice] % self.width, cells[choice] // self.width)
+            choice -= len(cells)
+        return None
+
+    def sample_for_resource(self, resource_type: str) -> tuple[int, int] | None:
+        cell = self.sample(RESOURCE_TILES.get(resource_type))
+        if cell is None:
+            cell = self.sample()
+        return cell
+
+    def cell_to_world(self, cell: tuple[int, int]) -> tuple[int, int]:
+        return (cell[0] * self.tile_size, cell[1] * self.tile_size)
+
+    def get_cells_for_rect(self, x: float, y: float, width: float, height: float) -> list[tuple[int, int]]:
+        left, top = int(x // self.tile_size), int(y // self.tile_size)
+        right = int((x + max(width, 1) - 1) // self.tile_size)
+        bottom = int((y + max(height, 1) - 1) // self.tile_size)
+        return [(cell_x, cell_y)
+                for cell_y in range(max(0, top), min(self.height - 1, bottom) + 1)
+                for cell_x in range(max(0, left), min(self.width - 1, right) + 1)]
+
+    def get_reserved_cells(self, cells: list[tuple[int, int]], spaced: bool) -> list[tuple[int, int]]:
+        """The cells themselves, grown by the spacing disk for entities that must keep their distance"""
+        if not spaced or self.min_spacing <= 0:
+            return cells
+        reserved = {}
+        for cell_x, cell_y in cells:
+            for dx, dy in self.spacing_offsets:
+                reserved[(cell_x + dx, cell_y + dy)] = None
+        return list(reserved)
+
+    def reserve(self, cells: list[tuple[int, int]]):
+        for cell in cells:
+            count = self.blockers.get(cell, 0)
+            self.blockers[cell] = count + 1
+            if count == 0 and self.in_bounds(cell):
+                self.remove_free_cell(cell)
+
+    def release(self, cells: list[tuple[int, int]]):
+        for cell in cells:
+            count = self.blockers.get(cell, 0)
+            if count > 1:
+                self.blockers[cell] = count - 1
+                continue
+            self.blockers.pop(cell, None)
+            if self.in_bounds(cell):
+                self.add_free_cell(cell)
@@ -1,10 +1,18 @@
 from os import system
+import threading
+from contextlib import contextmanager
 import pygame as pg
 from typing import TYPE_CHECKING
+from scheduler import SystemScheduler
+from input_source import PygameInput
 
 if TYPE_CHECKING:
     from ecs import Entity
     from ecs import System
+    from profiler import SystemProfiler
+    from navigation.pathfinding import NavigationGrid, PathFinder
+    from spatial_index import KDTreeIndex, GridIndex
+    from state_manager import StateManager
     
 class GameState:
     is_pausable = False
@@ -14,18 +22,102 @@ class GameState:
     state_data: dict[str, float] = {}
     resource_data: dict[str, float] = {}
     max_resource_data: dict[str, float] = {}
+    collision_events: list = []  # CollisionEvent list written by CollisionSystem each frame
+    collision_contacts: dict['Entity', list['Entity']] = {}
+    navigation_grid: 'NavigationGrid | None' = None  # set by NavigationSystem
+    path_finder: 'PathFinder | None' = None
+    camera: pg.Rect | None = None  # world area on screen; MapLoadingSystem streams chunks around it
+    spatial_indexes: dict[str, 'KDTreeIndex | GridIndex'] = {}  # set by SpatialIndexSystem, keyed by entity group
     max_trees = 120
+    scheduler: SystemScheduler | None = None
+    profiler: 'SystemProfiler | None' = None  # shared by all states, set by core.py
+    random_seed: int | None = None  # seeds every system's random.Random; None = different every run
+    map_path: str | None = None  # binary map to play instead of the one in assets/maps, used as is
+    input_source = PygameInput()  # swapped for a VirtualInput when running headless
+    interpolation_alpha: float = 1.0  # fraction of a simulation step elapsed since the last update
+    state_manager: 'StateManager | None' = None  # set when the state is added to a StateManager
+    entity_changes = threading.local()  # queue of deferred add/remove_entity calls for the current thread
     def enter(self):...
     def exit(self):...
 
+    def add_entity(self, entity: 'Entity'):
+        changes = getattr(self.entity_changes, "queue", None)
+        if changes is not None:
+            changes.append((self.add_entity, (entity,)))
+            return
+        self.entities.append(entity)
+        for system in self.systems.values():
+            system.on_entity_added(entity)
+
+    def remove_entity(self, entity: 'Entity'):
+        changes = getattr(self.entity_changes, "queue", None)
+        if changes is not None:
+            changes.append((self.remove_entity, (entity,)))
+            return
+        if entity not in self.entities:
+            return
+        self.entities.remove(entity)
+        for system in self.systems.values():
+            system.on_entity_removed(entity)
+
+    def unload_entity(self, entity: 'Entity', record_id: int):
+        """Remove an entity that still exists as a serialized record, so systems can keep what it reserves"""
+        changes = getattr(self.entity_changes, "queue", None)
+        if changes is not None:
+            changes.append((self.unload_entity, (entity, record_id)))
+            return
+        if entity not in self.entities:
+            return
+        self.entities.remove(entity)
+        for system in self.systems.values():
+            system.on_entity_unloaded(entity, record_id)
+
+    def restore_entity(self, entity: 'Entity', record_id: int):
+        changes = getattr(self.entity_changes, "queue", None)
+        if changes is not None:
+            changes.append((self.restore_entity, (entity, record_id)))
+            return
+        self.entities.append(entity)
+        for system in self.systems.values():
+            system.on_entity_restored(entity, record_id)
+
+    @contextmanager
+    def defer_entity_changes(self):
+        """Queue this thread's entity changes instead of changing the entity list other systems iterate"""
+        changes: list[tuple] = []
+        self.entity_changes.queue = changes
+        try:
+            yield changes
+        finally:
+            self.entity_changes.queue = None
+
+    def apply_entity_changes(self, changes: list[tuple]):
+        for change, arguments in changes:
+            change(*arguments)
+
+    def run_system(self, system: 'System', phase: str, *args):
+        method = getattr(system, phase)
+        if self.profiler is None:
+            return method(*args)
+        return self.profiler.measure(system.__class__.__name__, phase, method, *args)
+
     def handle_event(self, event):
         for system in self.systems.values():
-            system.handle_event(event)  
+            self.run_system(system, "handle_event", event)
+
+    def store_previous_positions(self):
+        for entity in self.entities:
+            if entity.has_components(['PositionComponent', 'VelocityComponent']):
+                position = entity.get_component("PositionComponent")
+                position.previous_x = position.x
+                position.previous_y = position.y
 
     def update(self, dt):
-        for system in self.systems.values():
-            system.update(dt)
+        self.store_previous_positions()
+        if self.scheduler is None or self.scheduler.systems is not self.systems:
+            self.scheduler = SystemScheduler(self.systems, self.run_system, self)
+        self.scheduler.update(dt)
 
     def render(self, screen):
         for system in self.systems.values():
-            system.render(screen)
\ No newline at end of file
+            self.run_system(system, "render", screen)
\ No newline at end of file
@@ -0,0 +1,63 @@
+import os
+# Must be set before pygame initialises its video/audio subsystems
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import time
+import pygame as pg
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, SIMULATION_STEP
+from game_state import GameState
+from input_source import VirtualInput
+
+class HeadlessRunner:
+    """Steps a GameState without a window: virtual clock, scripted input and no render passes"""
+    def __init__(self, state: GameState, step: float = SIMULATION_STEP, input_source: VirtualInput | None = None):
+        if not pg.get_init():
+            pg.init()
+        # The dummy driver still provides a display surface for convert_alpha and screen-size lookups
+        if not pg.display.get_surface():
+            pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.step = step
+        self.input_source = input_source or VirtualInput()
+        self.state = state
+        self.state.input_source = self.input_source
+        self.state.enter()
+        self.tick_count = 0
+        self.simulated_time = 0.0
+
+    def tick(self):
+        for event in self.input_source.get_events(self.tick_count):
+            self.state.handle_event(event)
+        self.state.update(self.step)
+        self.tick_count += 1
+        self.simulated_time += self.step
+
+    def run(self, ticks: int) -> float:
+        """Run `ticks` simulation steps as fast as possible and return the wall-clock seconds taken"""
+        start = time.perf_counter()
+        for _ in range(ticks):
+            self.tick()
+        return time.perf_counter() - start
+
+    def close(self):
+        self.state.exit()
+
+
+if __name__ == "__main__":
+    from play_state import PlayState
+
+    parser = argparse.ArgumentParser(description="Run the PlayState simulation without a display")
+    parser.add_argument("--ticks", type=int, default=3600, help="simulation steps to run")
+    parser.add_argument("--step", type=float, default=SIMULATION_STEP, help="seconds per simulation step")
+    parser.add_argument("--script", help="JSON input script (see VirtualInput.load_script)")
+    args = parser.parse_args()
+
+    script = VirtualInput.load_script(args.script) if args.script else None
+    runner = HeadlessRunner(PlayState(), step=args.step, input_source=VirtualInput(script))
+    elapsed = runner.run(args.ticks)
+    entity_count = len(runner.state.entities)
+    runner.close()
+    print(f"{args.ticks} ticks ({args.ticks * args.step:.1f}s simulated) in {elapsed:.2f}s "
+          f"= {args.ticks / elapsed:.1f} ticks/s, {entity_count} entities")
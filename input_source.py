@@ -0,0 +1,59 @@
+import json
+import pygame as pg
+
+class PygameInput:
+    """Mouse state read straight from pygame (the default for windowed play)"""
+    def get_mouse_position(self) -> tuple[int, int]:
+        return pg.mouse.get_pos()
+
+    def get_mouse_buttons(self) -> tuple[bool, bool, bool]:
+        return pg.mouse.get_pressed()
+
+class VirtualInput:
+    """Mouse state and events driven by a script instead of the OS, for headless runs"""
+    def __init__(self, script: dict[int, list[pg.event.Event]] | None = None):
+        self.script: dict[int, list[pg.event.Event]] = script or {}
+        self.mouse_position: tuple[int, int] = (0, 0)
+        self.mouse_buttons: list[bool] = [False, False, False]
+
+    @staticmethod
+    def load_script(file_path: str) -> dict[int, list[pg.event.Event]]:
+        """Load a JSON list of {"frame": 10, "type": "MOUSEBUTTONDOWN", "pos": [x, y], "button": 1, ...}"""
+        with open(file_path, "r") as f:
+            entries = json.load(f)
+        script: dict[int, list[pg.event.Event]] = {}
+        for entry in entries:
+            entry = dict(entry)
+            frame = int(entry.pop("frame"))
+            event_type = getattr(pg, entry.pop("type"))
+            for key in ("pos", "rel"):
+                if key in entry:
+                    entry[key] = tuple(entry[key])
+            script.setdefault(frame, []).append(pg.event.Event(event_type, entry))
+        return script
+
+    def get_mouse_position(self) -> tuple[int, int]:
+        return self.mouse_position
+
+    def get_mouse_buttons(self) -> tuple[bool, bool, bool]:
+        return (self.mouse_buttons[0], self.mouse_buttons[1], self.mouse_buttons[2])
+
+    def set_mouse(self, position: tuple[int, int], buttons: tuple[bool, bool, bool] | None = None):
+        self.mouse_position = (int(position[0]), int(position[1]))
+        if buttons is not None:
+            self.mouse_buttons = list(buttons)
+
+    def get_events(self, frame: int) -> list[pg.event.Event]:
+        events = self.script.get(frame, [])
+        for event in events:
+            self.apply_event(event)
+        return events
+
+    def apply_event(self, event):
+        """Keep the virtual mouse in sync with scripted mouse events"""
+        if event.type == pg.MOUSEMOTION:
+            self.mouse_position = tuple(event.pos)
+        elif event.type in (pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP):
+            self.mouse_position = tuple(event.pos)
+            if 1 <= event.button <= 3:
+                self.mouse_buttons[event.button - 1] = event.type == pg.MOUSEBUTTONDOWN
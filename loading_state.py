@@ -0,0 +1,47 @@
+import pygame as pg
+from config import *
+from game_state import GameState
+from asset_loader import AssetLoader
+from sprite_manager import SpriteManager
+
+class LoadingState(GameState):
+    """Shows a progress bar while AssetLoader decodes the sprites, then hands over to a new PlayState"""
+    def __init__(self, wait_for_assets: bool = False):
+        # Recording and replaying need the handover on the first update, not whenever the decode threads finish
+        self.wait_for_assets = wait_for_assets
+
+    def enter(self):
+        self.is_pausable = False
+        self.entities = []
+        self.systems = {}
+        self.font = pg.font.Font(None, 36)
+        self.loader = AssetLoader()
+        self.loader.start()
+        if self.wait_for_assets:
+            self.loader.finish()
+
+    def exit(self):
+        self.loader.cancel()
+
+    def handle_event(self, event):...
+
+    def update(self, dt):
+        self.loader.poll()
+        if not self.loader.is_done():
+            return
+        # With no PNGs to decode SpriteManager falls back to the backup pickle itself
+        if self.loader.sprites:
+            SpriteManager.set_shared_sprites(self.loader.sprites)
+        from play_state import PlayState  # Imported late so the loading screen shows before the game modules load
+        self.state_manager.add_and_set_current_state(PlayState())
+
+    def render(self, screen):
+        bar = pg.Rect(0, 0, SCREEN_WIDTH // 2, 24)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        filled = bar.copy()
+        filled.width = int(bar.width * self.loader.get_progress())
+        pg.draw.rect(screen, (60, 60, 60), bar)
+        pg.draw.rect(screen, (27, 150, 27), filled)
+        pg.draw.rect(screen, (255, 255, 255), bar, width=2)
+        text = self.font.render("Loading...", True, (255, 255, 255))
+        screen.blit(text, text.get_rect(midbottom=(bar.centerx, bar.top - 10)))
@@ -1,2 +1,26 @@
+# Tile types stored in the map data
+TILE_GRASS = 0
+TILE_DIRT = 1
+TILE_WATER = 2
+TILE_STONE = 3
+
+BLOCKING_TILES = {TILE_WATER}  # tiles nothing can walk or build on
+
+# Biome regions (map layer 1)
+BIOME_PLAINS = 0
+BIOME_FOREST = 1
+BIOME_BARREN = 2
+BIOME_MOUNTAINS = 3
+BIOME_LAKE = 4
+
+# Objects placed at generation time (map layer 2)
+OBJECT_NONE = 0
+OBJECT_TREE = 1
+OBJECT_STONE = 2
+
+TILE_LAYER = 0
+BIOME_LAYER = 1
+OBJECT_LAYER = 2
+
 class Map:
     map = [[None for _ in range(10)] for _ in range(10)]
@@ -0,0 +1,204 @@
+import math
+import numpy as np
+from navigation.pathfinding import NavigationGrid, NEIGHBOURS
+
+INF = np.float32(np.inf)
+MIN_STEP_COST = min(step_cost for _, _, step_cost in NEIGHBOURS)
+OFFSETS_X = np.array([dx for dx, _, _ in NEIGHBOURS], dtype=np.int64)
+OFFSETS_Y = np.array([dy for _, dy, _ in NEIGHBOURS], dtype=np.int64)
+STEP_COSTS = np.array([step_cost for _, _, step_cost in NEIGHBOURS], dtype=np.float32)
+UNIT_X = np.array([dx / math.hypot(dx, dy) for dx, dy, _ in NEIGHBOURS], dtype=np.float32)
+UNIT_Y = np.array([dy / math.hypot(dx, dy) for dx, dy, _ in NEIGHBOURS], dtype=np.float32)
+STEP_INDEX = np.arange(len(NEIGHBOURS))[:, np.newaxis]
+
+class FlowField:
+    """Distance-to-goal over the whole grid plus the direction to walk from every cell, shared by all agents"""
+    def __init__(self, grid: NavigationGrid):
+        self.grid = grid
+        self.goal: tuple[int, int] | None = None
+        self.revision = -1  # grid revision the field was built from
+        self.blocked = np.zeros(0, dtype=np.uint8)  # the grid's blocked cells at that revision
+        self.integration = np.full((grid.height, grid.width), INF, dtype=np.float32)
+        self.direction_x = np.zeros((grid.height, grid.width), dtype=np.float32)
+        self.direction_y = np.zeros((grid.height, grid.width), dtype=np.float32)
+        # NEIGHBOURS index of the step each cell's distance was reached through (not always the walking direction)
+        self.parent_step = np.full(grid.height * grid.width, -1, dtype=np.int64)
+        self.rebuilds = 0
+        self.repairs = 0
+
+    def is_stale(self, goal: tuple[int, int]) -> bool:
+        return goal != self.goal or self.revision != self.grid.revision
+
+    def update(self, goal: tuple[int, int]) -> bool:
+        """Bring the field up to date with the goal and the obstacles; returns True if any direction was recomputed.
+        A new goal rebuilds the field, obstacle changes only repair the part of it they touch"""
+        if not self.is_stale(goal):
+            return False
+        grid = self.grid
+        blocked = np.frombuffer(grid.blocked, dtype=np.uint8)
+        if goal != self.goal or blocked.shape != self.blocked.shape:
+            self.compute(goal)
+            return True
+        changed = np.flatnonzero(blocked != self.blocked)
+        self.revision = grid.revision
+        self.blocked = blocked.copy()
+        if changed.size == 0 or not self.get_neighbourhood(changed, np.isfinite(self.integration).ravel()).size:
+            # Only cells the field never reached changed, so every direction is still right
+            return False
+        self.repair(changed)
+        return True
+
+    def get_neighbourhood(self, cells: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+        """The in-bounds cells of the 3x3 blocks around `cells`, optionally only those set in `mask`"""
+        width, height = self.grid.width, self.grid.height
+        cells_y, cells_x = np.divmod(cells, width)
+        around_x = (cells_x[np.newaxis, :] + np.array([-1, 0, 1, -1, 0, 1, -1, 0, 1])[:, np.newaxis]).ravel()
+        around_y = (cells_y[np.newaxis, :] + np.array([-1, -1, -1, 0, 0, 0, 1, 1, 1])[:, np.newaxis]).ravel()
+        inside = (around_x >= 0) & (around_x < width) & (around_y >= 0) & (around_y < height)
+        around = np.unique(around_y[inside] * width + around_x[inside])
+        return around if mask is None else around[mask[around]]
+
+    def get_passable(self, goal: tuple[int, int]) -> np.ndarray:
+        grid = self.grid
+        passable = np.frombuffer(grid.blocked, dtype=np.uint8).reshape(grid.height, grid.width) == 0
+        if grid.in_bounds(*goal):
+            # The goal is walked to even when something stands on it
+            passable[goal[1], goal[0]] = True
+        return passable
+
+    def get_step_masks(self, passable: np.ndarray) -> list[np.ndarray]:
+        """For each neighbour offset, the cells from which that step is allowed (no cutting corners)"""
+        padded = np.pad(passable, 1, constant_values=False)
+        height, width = passable.shape
+
+        def neighbour(dx: int, dy: int) -> np.ndarray:
+            return padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+
+        masks = []
+        for dx, dy, _ in NEIGHBOURS:
+            mask = passable & neighbour(dx, dy)
+            if dx and dy:
+                mask &= neighbour(dx, 0) & neighbour(0, dy)
+            masks.append(mask)
+        return masks
+
+    def compute(self, goal: tuple[int, int]):
+        grid = self.grid
+        self.goal = goal
+        self.revision = grid.revision
+        self.blocked = np.frombuffer(grid.blocked, dtype=np.uint8).copy()
+        self.rebuilds += 1
+        height, width = grid.height, grid.width
+        integration = np.full(height * width, INF, dtype=np.float32)
+        if not grid.in_bounds(*goal):
+            self.integration = integration.reshape(height, width)
+            self.direction_x = np.zeros((height, width), dtype=np.float32)
+            self.direction_y = np.zeros((height, width), dtype=np.float32)
+            self.parent_step = np.full(height * width, -1, dtype=np.int64)
+            return
+        masks = self.get_step_masks(self.get_passable(goal))
+        goal_index = goal[1] * width + goal[0]
+        integration[goal_index] = 0.0
+        self.integrate(integration, np.array([goal_index], dtype=np.int64), masks)
+        self.set_directions(integration, masks)
+
+    def repair(self, changed: np.ndarray):
+        """Recompute only the cells whose route ran through a changed cell or past its corners"""
+        width = self.grid.width
+        goal_index = self.goal[1] * width + self.goal[0]
+        newly_blocked = changed[self.blocked[changed] == 1]
+        roots = self.get_neighbourhood(newly_blocked) if newly_blocked.size else newly_blocked
+        affected = self.get_descendants(roots)
+        if affected[goal_index]:
+            self.compute(self.goal)
+            return
+        self.repairs += 1
+        integration = self.integration.ravel().copy()
+        integration[affected] = INF
+        # Routes into the reset cells start at their reached border; freed cells open routes past their 3x3 block
+        reached = np.isfinite(integration)
+        seeds = self.get_neighbourhood(np.concatenate((np.flatnonzero(affected), changed)), reached)
+        masks = self.get_step_masks(self.get_passable(self.goal))
+        self.integrate(integration, seeds, masks)
+        self.set_directions(integration, masks)
+
+    def get_descendants(self, roots: np.ndarray) -> np.ndarray:
+        """Mask of `roots` plus every cell whose route to the goal passes through one of them"""
+        height, width = self.grid.height, self.grid.width
+        descendants = np.zeros(height * width, dtype=bool)
+        descendants[roots] = True
+        frontier = roots
+        while frontier.size:
+            # A child's route steps onto its parent, so it lies one step back along its parent step
+            frontier_y, frontier_x = np.divmod(frontier, width)
+            child_x = frontier_x - OFFSETS_X[:, np.newaxis]
+            child_y = frontier_y - OFFSETS_Y[:, np.newaxis]
+            inside = (child_x >= 0) & (child_x < width) & (child_y >= 0) & (child_y < height)
+            steps = np.broadcast_to(STEP_INDEX, inside.shape)[inside]
+            children = (child_y * width + child_x)[inside]
+            children = children[(self.parent_step[children] == steps) & ~descendants[children]]
+            descendants[children] = True
+            frontier = children
+        return descendants
+
+    def integrate(self, integration: np.ndarray, open_cells: np.ndarray, masks: list[np.ndarray]):
+        """Dijkstra from `open_cells` over the flat `integration`, lowering any cell it can reach more cheaply.
+        It runs in batches: with no step cheaper than MIN_STEP_COST, no open cell within that of the smallest
+        open distance can still improve, so they all settle together and each cell is expanded once"""
+        height, width = self.grid.height, self.grid.width
+        allowed = np.stack([mask.ravel() for mask in masks])
+        settled = np.zeros(height * width, dtype=bool)
+        is_open = np.zeros(height * width, dtype=bool)
+        is_open[open_cells] = True
+        while open_cells.size:
+            distances = integration[open_cells]
+            settling = distances <= distances.min() + MIN_STEP_COST
+            current = open_cells[settling]
+            open_cells = open_cells[~settling]
+            settled[current] = True
+            is_open[current] = False
+
+            # A cell reaches a settled cell by stepping onto it, so it lies one step back along each offset
+            current_y, current_x = np.divmod(current, width)
+            from_x = current_x - OFFSETS_X[:, np.newaxis]
+            from_y = current_y - OFFSETS_Y[:, np.newaxis]
+            inside = (from_x >= 0) & (from_x < width) & (from_y >= 0) & (from_y < height)
+            steps = np.broadcast_to(STEP_INDEX, inside.shape)[inside]
+            cells = (from_y * width + from_x)[inside]
+            costs = (integration[current] + STEP_COSTS[:, np.newaxis])[inside]
+            valid = allowed[steps, cells] & ~settled[cells]
+            cells = cells[valid]
+            previous = integration[cells]
+            np.minimum.at(integration, cells, costs[valid])
+            improved = cells[integration[cells] < previous]
+            new_cells = np.unique(improved[~is_open[improved]])
+            is_open[new_cells] = True
+            open_cells = np.concatenate((open_cells, new_cells))
+
+    def set_directions(self, integration: np.ndarray, masks: list[np.ndarray]):
+        # Each cell points at its cheapest neighbour; unreachable cells and the goal itself point nowhere
+        height, width = self.grid.height, self.grid.width
+        integration = integration.reshape(height, width)
+        self.integration = integration
+        padded = np.full((height + 2, width + 2), INF, dtype=np.float32)
+        padded[1:-1, 1:-1] = integration
+        candidates = np.empty((len(NEIGHBOURS), height, width), dtype=np.float32)
+        for i, ((dx, dy, _), mask) in enumerate(zip(NEIGHBOURS, masks)):
+            candidates[i] = padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+            candidates[i][~mask] = INF
+        best = np.argmin(candidates, axis=0)
+        moving = np.isfinite(integration) & (np.min(candidates, axis=0) < integration)
+        candidates += STEP_COSTS[:, np.newaxis, np.newaxis]
+        self.parent_step = np.where(moving, np.argmin(candidates, axis=0), -1).ravel()
+        self.direction_x = np.where(moving, UNIT_X[best], 0.0).astype(np.float32)
+        self.direction_y = np.where(moving, UNIT_Y[best], 0.0).astype(np.float32)
+
+    def get_direction(self, cell_x: int, cell_y: int) -> tuple[float, float]:
+        if not self.grid.in_bounds(cell_x, cell_y):
+            return (0.0, 0.0)
+        return (float(self.direction_x[cell_y, cell_x]), float(self.direction_y[cell_y, cell_x]))
+
+    def get_distance(self, cell_x: int, cell_y: int) -> float:
+        if not self.grid.in_bounds(cell_x, cell_y):
+            return math.inf
+        return float(self.integration[cell_y, cell_x])
@@ -0,0 +1,190 @@
+import heapq
+import math
+import numpy as np
+from collections import OrderedDict
+from map import BLOCKING_TILES
+
+SQRT2 = math.sqrt(2)
+NEIGHBOURS = [(1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+              (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2)]
+
+class NavigationGrid:
+    """Walkability of the tile grid: blocking terrain from the map plus entities occupying cells"""
+    def __init__(self, map_data, tile_size: int, blocking_tiles: set[int] = BLOCKING_TILES):
+        self.tile_size = tile_size
+        self.blocking_tiles = blocking_tiles
+        self.width = 0
+        self.height = 0
+        self.version = 0  # bumped whenever the terrain is replaced; occupancy changes are incremental
+        self.revision = 0  # bumped on any change to `blocked`, for consumers that rebuild wholesale
+        self.load_terrain(map_data)
+
+    def load_terrain(self, map_data):
+        tiles = np.asarray(map_data)
+        self.height = len(tiles)
+        self.width = len(tiles[0]) if self.height else 0
+        blocked = np.isin(tiles, list(self.blocking_tiles)).astype(np.uint8)
+        self.terrain_blocked = bytearray(blocked.tobytes())
+        self.occupancy = [0] * (self.width * self.height)  # blocking entities per cell
+        self.blocked = bytearray(self.terrain_blocked)
+        self.version += 1
+        self.revision += 1
+
+    def index(self, cell_x: int, cell_y: int) -> int:
+        return cell_y * self.width + cell_x
+
+    def in_bounds(self, cell_x: int, cell_y: int) -> bool:
+        return 0 <= cell_x < self.width and 0 <= cell_y < self.height
+
+    def is_walkable(self, cell_x: int, cell_y: int) -> bool:
+        return self.in_bounds(cell_x, cell_y) and not self.blocked[cell_y * self.width + cell_x]
+
+    def world_to_cell(self, x: float, y: float) -> tuple[int, int]:
+        return (int(x // self.tile_size), int(y // self.tile_size))
+
+    def cell_to_world(self, cell_x: int, cell_y: int) -> tuple[float, float]:
+        """Centre of the cell in world coordinates"""
+        return ((cell_x + 0.5) * self.tile_size, (cell_y + 0.5) * self.tile_size)
+
+    def get_cells_for_rect(self, x: float, y: float, width: float, height: float) -> list[tuple[int, int]]:
+        left, top = self.world_to_cell(x, y)
+        right, bottom = self.world_to_cell(x + max(width, 1) - 1, y + max(height, 1) - 1)
+        return [(cell_x, cell_y)
+                for cell_y in range(max(0, top), min(self.height - 1, bottom) + 1)
+                for cell_x in range(max(0, left), min(self.width - 1, right) + 1)]
+
+    def add_occupant(self, cells: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Mark cells as occupied and return the ones that just became blocked"""
+        newly_blocked = []
+        for cell_x, cell_y in cells:
+            i = self.index(cell_x, cell_y)
+            self.occupancy[i] += 1
+            if not self.blocked[i]:
+                self.blocked[i] = 1
+                newly_blocked.append((cell_x, cell_y))
+        if newly_blocked:
+            self.revision += 1
+        return newly_blocked
+
+    def remove_occupant(self, cells: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Release cells and return the ones that just became walkable"""
+        newly_free = []
+        for cell_x, cell_y in cells:
+            i = self.index(cell_x, cell_y)
+            self.occupancy[i] = max(0, self.occupancy[i] - 1)
+            if self.occupancy[i] == 0 and not self.terrain_blocked[i] and self.blocked[i]:
+                self.blocked[i] = 0
+                newly_free.append((cell_x, cell_y))
+        if newly_free:
+            self.revision += 1
+        return newly_free
+
+class PathFinder:
+    """A* over a NavigationGrid with an LRU cache of finished routes"""
+    def __init__(self, grid: NavigationGrid, cache_size: int = 1024, max_expansions: int = 20000):
+        self.grid = grid
+        self.cache_size = cache_size
+        self.max_expansions = max_expansions
+        # (start cell, goal cell, grid version) -> path of cells (None when unreachable)
+        self.cache: OrderedDict[tuple, list[tuple[int, int]] | None] = OrderedDict()
+        self.paths_through_cell: dict[tuple[int, int], set[tuple]] = {}
+        self.failed_searches: set[tuple] = set()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]] | None:
+        """Cells from just after `start` up to and including `goal`; the returned list is shared, don't modify it"""
+        key = (start, goal, self.grid.version)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return self.cache[key]
+
+        self.cache_misses += 1
+        path = self.search(start, goal)
+        self.cache[key] = path
+        if path is None:
+            self.failed_searches.add(key)
+        else:
+            for cell in path:
+                self.paths_through_cell.setdefault(cell, set()).add(key)
+        if len(self.cache) > self.cache_size:
+            self.evict(next(iter(self.cache)))
+        return path
+
+    def evict(self, key: tuple):
+        path = self.cache.pop(key, None)
+        self.failed_searches.discard(key)
+        if path:
+            for cell in path:
+                keys = self.paths_through_cell.get(cell)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.paths_through_cell[cell]
+
+    def invalidate_blocked(self, cells: list[tuple[int, int]]):
+        """Drop cached routes that walk through cells which just became blocked"""
+        for cell in cells:
+            for key in list(self.paths_through_cell.get(cell, ())):
+                self.evict(key)
+
+    def invalidate_freed(self, cells: list[tuple[int, int]]):
+        """Freed cells can only make failed searches succeed; existing routes stay valid"""
+        if cells:
+            for key in list(self.failed_searches):
+                self.evict(key)
+
+    def heuristic(self, cell: tuple[int, int], goal: tuple[int, int]) -> float:
+        # Octile distance: exact cost on an empty 8-connected grid
+        dx = abs(cell[0] - goal[0])
+        dy = abs(cell[1] - goal[1])
+        return (dx + dy) + (SQRT2 - 2) * min(dx, dy)
+
+    def search(self, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]] | None:
+        grid = self.grid
+        if not grid.in_bounds(*start) or not grid.in_bounds(*goal):
+            return None
+        if start == goal:
+            return [goal]
+
+        def passable(cell_x: int, cell_y: int) -> bool:
+            # The goal is usually the blocked cell of the thing being walked to
+            return grid.is_walkable(cell_x, cell_y) or (cell_x, cell_y) == goal
+
+        open_heap: list[tuple[float, int, tuple[int, int]]] = [(self.heuristic(start, goal), 0, start)]
+        came_from: dict[tuple[int, int], tuple[int, int]] = {}
+        cost_so_far: dict[tuple[int, int], float] = {start: 0.0}
+        counter = 0  # tie breaker so the heap never compares cells
+        expansions = 0
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current == goal:
+                return self.reconstruct_path(came_from, start, goal)
+            expansions += 1
+            if expansions > self.max_expansions:
+                return None
+            current_cost = cost_so_far[current]
+            cell_x, cell_y = current
+            for dx, dy, step_cost in NEIGHBOURS:
+                next_x, next_y = cell_x + dx, cell_y + dy
+                if not passable(next_x, next_y):
+                    continue
+                # No cutting corners past blocked cells on diagonal moves
+                if dx and dy and not (passable(cell_x + dx, cell_y) and passable(cell_x, cell_y + dy)):
+                    continue
+                next_cell = (next_x, next_y)
+                new_cost = current_cost + step_cost
+                if new_cost < cost_so_far.get(next_cell, math.inf):
+                    cost_so_far[next_cell] = new_cost
+                    came_from[next_cell] = current
+                    counter += 1
+                    heapq.heappush(open_heap, (new_cost + self.heuristic(next_cell, goal), counter, next_cell))
+        return None
+
+    def reconstruct_path(self, came_from: dict, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
+        path = [goal]
+        while path[-1] in came_from and came_from[path[-1]] != start:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return path
@@ -12,10 +12,13 @@ from systems.main_systems.map_loading_system import MapLoadingSystem
 from systems.main_systems.input_system import InputSystem
 from systems.main_systems.movement_system import MovementSystem 
 from systems.main_systems.collision_system import CollisionSystem
+from systems.main_systems.navigation_system import NavigationSystem
+from systems.main_systems.spatial_index_system import SpatialIndexSystem
 
 from systems.entity_management_systems.shooting_system import ShootingSystem
 from systems.entity_management_systems.turrent_auto_firing_system import TurretAutoFiringSystem
 from systems.entity_management_systems.worker_management_system import WorkerManagementSystem
+from systems.entity_management_systems.enemy_navigation_system import EnemyNavigationSystem
 from systems.entity_management_systems.random_resource_generation_system import RandomResourceGenerationSystem
 
 from systems.ui_systems.toolbar_system import ToolbarSystem
@@ -27,22 +30,32 @@ from ecs import PositionComponent,SpawnerComponent, SpriteComponent, VelocityCom
 from ecs import ControllableComponent, EnemyComponent, HealthComponent, CollisionComponent, System
 from ecs import SizeComponent, WorkerComponent
 from factory.entity_factory import EntityFactory
+from factory.resource_factory import ResourceFactory
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
 import re
 
 class PlayState(GameState):
     def enter(self):
         self.is_pausable = True
+        # Each PlayState gets its own world, so back-to-back runs (e.g. benchmarks) don't share entities
+        self.entities = []
+        self.state_data = {}
+        self.reset_shared_world()
+        self.camera = pg.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)  # Fixed until the view can scroll
         self.main_systems_list = [
             "InputSystem",
             "MovementSystem",
             "CollisionSystem",
             "MapLoadingSystem",
+            "NavigationSystem",
+            "SpatialIndexSystem",
             "RenderSystem"
         ]
         self.entity_management_systems_list = [
             "ShootingSystem",
             "TurretAutoFiringSystem",
             "WorkerManagementSystem",
+            "EnemyNavigationSystem",
             "RandomResourceGenerationSystem"
         ]
         self.ui_systems_list = [
@@ -59,8 +72,24 @@ class PlayState(GameState):
         self.state_data["coins"] = 100
         self.state_data["wave"] = 0
         
+    def reset_shared_world(self):
+        """Drop what earlier worlds left in class-level registries, counters and GameState fields"""
+        Entity.EntityRegistry.clear()
+        ResourceFactory.COUNT.clear()
+        ShootingSystem.BULLET_COUNT = 0
+        self.resource_data = {}
+        self.max_resource_data = {}
+        self.collision_events = []
+        self.collision_contacts = {}
+        self.spatial_indexes = {}
+        self.navigation_grid = None
+        self.path_finder = None
+        self.scheduler = None
+
     def systems_initialization(self) -> dict[str, System]:
+        # Filled in place so systems created later are announced to the ones created before them
         systems = {}
+        self.systems = systems
         # Initialize main systems
         main_systems = self.system_initialization(self.main_systems_list)
         systems.update(main_systems)
@@ -105,6 +134,7 @@ class PlayState(GameState):
                 system_class = globals().get(system_name)
                 if system_class:
                     systems[system_name] = system_class(self)
+                    self.systems[system_name] = systems[system_name]
                     print(f"Initialized system: {system_class_name}")
                 else:
                     print(f"Warning: Class '{system_name}' not found in globals")
@@ -114,5 +144,10 @@ class PlayState(GameState):
 
     def exit(self):
         print("Exiting Play State")
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+        map_loading_system = self.systems.get("MapLoadingSystem")
+        if map_loading_system is not None:
+            map_loading_system.shutdown()
         self.sprite_manager.save_n_exit()
     
@@ -0,0 +1,151 @@
+import csv
+import threading
+import time
+from collections import deque
+import pygame as pg
+
+class SystemProfiler:
+    """Times every system's handle_event/update/render call and keeps rolling per-frame statistics"""
+    PHASES = ("handle_event", "update", "render")
+
+    def __init__(self, window: int = 240, csv_path: str | None = None):
+        self.window = window  # frames kept for percentiles and the frame-time graph
+        self.lock = threading.Lock()  # update() may be called from the scheduler's thread pool
+        self.frame_samples: dict[tuple[str, str], int] = {}  # nanoseconds spent this frame per (system, phase)
+        self.samples: dict[tuple[str, str], deque[int]] = {}
+        self.totals: dict[tuple[str, str], int] = {}  # nanoseconds since the profiler was created
+        self.frame_times: deque[float] = deque(maxlen=window)  # milliseconds
+        self.frame_start = time.perf_counter_ns()
+        self.frame_index = 0
+
+        self.csv_path = csv_path
+        self.csv_file = None
+        self.csv_writer = None
+
+        # Overlay
+        self.is_overlay_visible = False
+        self.toggle_key = pg.K_F3
+        self.refresh_interval = 0.5  # seconds between overlay text refreshes
+        self.last_refresh = 0.0
+        self.overlay_lines: list[str] = []
+        self.font = None
+
+    def measure(self, system_name: str, phase: str, method, *args):
+        start = time.perf_counter_ns()
+        try:
+            return method(*args)
+        finally:
+            duration = time.perf_counter_ns() - start
+            key = (system_name, phase)
+            with self.lock:
+                self.frame_samples[key] = self.frame_samples.get(key, 0) + duration
+
+    def end_frame(self):
+        """Close the current frame: push its samples into the rolling windows and the CSV file"""
+        now = time.perf_counter_ns()
+        frame_time = (now - self.frame_start) / 1_000_000
+        self.frame_start = now
+        self.frame_times.append(frame_time)
+
+        with self.lock:
+            frame_samples = self.frame_samples
+            self.frame_samples = {}
+        for key, duration in frame_samples.items():
+            if key not in self.samples:
+                self.samples[key] = deque(maxlen=self.window)
+            self.samples[key].append(duration)
+            self.totals[key] = self.totals.get(key, 0) + duration
+
+        if self.csv_path:
+            self.write_csv_rows(frame_time, frame_samples)
+        self.frame_index += 1
+
+    def write_csv_rows(self, frame_time: float, frame_samples: dict[tuple[str, str], int]):
+        if self.csv_writer is None:
+            self.csv_file = open(self.csv_path, "w", newline="")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(["frame", "system", "phase", "ms"])
+        self.csv_writer.writerow([self.frame_index, "Frame", "total", f"{frame_time:.4f}"])
+        for (system_name, phase), duration in frame_samples.items():
+            self.csv_writer.writerow([self.frame_index, system_name, phase, f"{duration / 1_000_000:.4f}"])
+
+    def get_percentiles(self, key: tuple[str, str]) -> tuple[float, float, float]:
+        """Returns (p50, p95, p99) in milliseconds over the rolling window"""
+        samples = sorted(self.samples.get(key, ()))
+        if not samples:
+            return (0.0, 0.0, 0.0)
+        def percentile(fraction: float) -> float:
+            index = min(len(samples) - 1, int(round(fraction * (len(samples) - 1))))
+            return samples[index] / 1_000_000
+        return (percentile(0.50), percentile(0.95), percentile(0.99))
+
+    def get_archetype_counts(self, entities) -> list[tuple[str, int]]:
+        counts: dict[frozenset, int] = {}
+        for entity in entities:
+            archetype = frozenset(entity.components)
+            counts[archetype] = counts.get(archetype, 0) + 1
+        named_counts = []
+        for archetype, count in counts.items():
+            names = sorted(name.removesuffix("Component") for name in archetype if name != "TooltipComponent")
+            named_counts.append(("+".join(names) or "Tooltip", count))
+        return sorted(named_counts, key=lambda item: item[1], reverse=True)
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+    def handle_event(self, event):
+        if event.type == pg.KEYDOWN and event.key == self.toggle_key:
+            self.is_overlay_visible = not self.is_overlay_visible
+            self.last_refresh = 0.0
+
+    def refresh_overlay_lines(self, entities):
+        lines = [f"Frame {self.frame_times[-1] if self.frame_times else 0:.2f} ms   entities {len(entities)}",
+                 "system.phase               p50    p95    p99 (ms)"]
+        rows = []
+        for key in self.samples:
+            rows.append((key, self.get_percentiles(key)))
+        rows.sort(key=lambda row: row[1][1], reverse=True)
+        for (system_name, phase), (p50, p95, p99) in rows[:12]:
+            label = f"{system_name.removesuffix('System')}.{phase}"
+            lines.append(f"{label[:24]:<24} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        lines.append("archetypes")
+        for name, count in self.get_archetype_counts(entities)[:6]:
+            lines.append(f"{count:6d}  {name[:40]}")
+        self.overlay_lines = lines
+
+    def render(self, screen: pg.Surface, entities):
+        if not self.is_overlay_visible:
+            return
+        now = time.perf_counter()
+        if now - self.last_refresh >= self.refresh_interval:
+            self.last_refresh = now
+            self.refresh_overlay_lines(entities)
+        if self.font is None:
+            self.font = pg.font.SysFont("consolas,couriernew,monospace", 14)
+
+        line_height = 16
+        graph_height = 60
+        width = 420
+        height = len(self.overlay_lines) * line_height + graph_height + 20
+        panel = pg.Surface((width, height), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        for i, line in enumerate(self.overlay_lines):
+            text_surface = self.font.render(line, True, (220, 220, 220))
+            panel.blit(text_surface, (8, 6 + i * line_height))
+
+        # Frame-time graph, scaled so the 60 FPS budget sits at mid height
+        graph_top = height - graph_height - 8
+        budget_ms = 1000 / 60
+        scale = (graph_height / 2) / budget_ms
+        pg.draw.line(panel, (90, 90, 90), (8, graph_top + graph_height / 2), (width - 8, graph_top + graph_height / 2))
+        if len(self.frame_times) > 1:
+            step = (width - 16) / (self.window - 1)
+            points = []
+            for i, frame_time in enumerate(self.frame_times):
+                y = graph_top + graph_height - min(graph_height, frame_time * scale)
+                points.append((8 + i * step, y))
+            pg.draw.lines(panel, (80, 220, 120), False, points)
+        screen.blit(panel, (screen.get_width() - width - 10, 80))
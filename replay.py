@@ -0,0 +1,137 @@
+import struct
+import pygame as pg
+from input_source import VirtualInput
+
+# Binary log layout (little endian):
+#   header: magic, version, seed (-1 = unseeded)
+#   then records, each starting with its kind:
+#   frame:  dt, mouse x, mouse y, mouse button bits, event count, then each event as type + payload
+#   marker: what happened during the update of the frame before it, e.g. MARKER_STATE_CHANGE
+HEADER = struct.Struct("<4sBq")
+RECORD_KIND = struct.Struct("<B")
+FRAME = struct.Struct("<fhhBH")
+MARKER = struct.Struct("<B")
+EVENT_TYPE = struct.Struct("<H")
+MAGIC = b"FGRL"
+VERSION = 2
+RECORD_FRAME = 0
+RECORD_MARKER = 1
+MARKER_STATE_CHANGE = 0  # the state manager switched states, e.g. LoadingState handing over to PlayState
+
+# Only events the game reacts to are recorded; the payload keeps the attributes the systems read
+EVENT_PAYLOADS: dict[int, tuple[struct.Struct, tuple[str, ...]]] = {
+    pg.KEYDOWN: (struct.Struct("<IH"), ("key", "mod")),
+    pg.KEYUP: (struct.Struct("<IH"), ("key", "mod")),
+    pg.MOUSEBUTTONDOWN: (struct.Struct("<hhB"), ("pos", "button")),
+    pg.MOUSEBUTTONUP: (struct.Struct("<hhB"), ("pos", "button")),
+    pg.MOUSEMOTION: (struct.Struct("<hhhhB"), ("pos", "rel", "buttons")),
+    pg.MOUSEWHEEL: (struct.Struct("<hh"), ("x", "y")),
+    pg.QUIT: (struct.Struct("<"), ()),
+}
+
+def pack_buttons(buttons) -> int:
+    bits = 0
+    for i, pressed in enumerate(buttons[:8]):
+        if pressed:
+            bits |= 1 << i
+    return bits
+
+def unpack_buttons(bits: int, count: int = 3) -> tuple:
+    return tuple(bool(bits & (1 << i)) for i in range(count))
+
+def encode_event(event) -> bytes | None:
+    payload = EVENT_PAYLOADS.get(event.type)
+    if payload is None:
+        return None
+    payload_struct, attributes = payload
+    values = []
+    for attribute in attributes:
+        value = getattr(event, attribute)
+        if attribute in ("pos", "rel"):
+            values.extend((int(value[0]), int(value[1])))
+        elif attribute == "buttons":
+            values.append(pack_buttons(value))
+        else:
+            values.append(int(value))
+    return EVENT_TYPE.pack(event.type) + payload_struct.pack(*values)
+
+class InputRecorder:
+    """Writes the per-frame dt, mouse state and input events of a session to a compact binary log"""
+    def __init__(self, file_path: str, seed: int | None):
+        self.file = open(file_path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, -1 if seed is None else seed))
+        self.frame_count = 0
+
+    def record_frame(self, dt: float, events: list, mouse_position: tuple[int, int], mouse_buttons):
+        encoded_events = [encoded for encoded in (encode_event(event) for event in events) if encoded is not None]
+        self.file.write(RECORD_KIND.pack(RECORD_FRAME))
+        self.file.write(FRAME.pack(dt, mouse_position[0], mouse_position[1], pack_buttons(mouse_buttons), len(encoded_events)))
+        for encoded in encoded_events:
+            self.file.write(encoded)
+        self.frame_count += 1
+
+    def record_marker(self, marker: int):
+        self.file.write(RECORD_KIND.pack(RECORD_MARKER) + MARKER.pack(marker))
+
+    def close(self):
+        self.file.close()
+        print(f"Recorded {self.frame_count} frames")
+
+class ReplayFrame:
+    def __init__(self, dt: float, mouse_position: tuple[int, int], mouse_buttons: tuple, events: list):
+        self.dt = dt
+        self.mouse_position = mouse_position
+        self.mouse_buttons = mouse_buttons
+        self.events = events
+
+class InputReplayer:
+    """Plays an InputRecorder log back frame by frame through a VirtualInput"""
+    def __init__(self, file_path: str):
+        with open(file_path, "rb") as f:
+            self.data = f.read()
+        magic, version, seed = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{file_path} is not a version {VERSION} input log")
+        self.seed: int | None = None if seed == -1 else seed
+        self.offset = HEADER.size
+        self.frame_count = 0
+        self.input_source = VirtualInput()
+
+    def read_markers(self) -> list[int]:
+        """The markers recorded after the frame returned last"""
+        markers = []
+        while self.offset < len(self.data) and self.data[self.offset] == RECORD_MARKER:
+            (marker,) = MARKER.unpack_from(self.data, self.offset + RECORD_KIND.size)
+            self.offset += RECORD_KIND.size + MARKER.size
+            markers.append(marker)
+        return markers
+
+    def next_frame(self) -> ReplayFrame | None:
+        self.read_markers()  # Markers nobody checked
+        if self.offset >= len(self.data):
+            return None
+        self.offset += RECORD_KIND.size
+        dt, mouse_x, mouse_y, button_bits, event_count = FRAME.unpack_from(self.data, self.offset)
+        self.offset += FRAME.size
+        events = []
+        for _ in range(event_count):
+            (event_type,) = EVENT_TYPE.unpack_from(self.data, self.offset)
+            self.offset += EVENT_TYPE.size
+            payload_struct, attributes = EVENT_PAYLOADS[event_type]
+            values = list(payload_struct.unpack_from(self.data, self.offset))
+            self.offset += payload_struct.size
+            event_data = {}
+            for attribute in attributes:
+                if attribute in ("pos", "rel"):
+                    event_data[attribute] = (values.pop(0), values.pop(0))
+                elif attribute == "buttons":
+                    event_data[attribute] = unpack_buttons(values.pop(0))
+                else:
+                    event_data[attribute] = values.pop(0)
+            events.append(pg.event.Event(event_type, event_data))
+
+        mouse_buttons = unpack_buttons(button_bits)
+        # Systems read the mouse through the state's input source, so it must match the recording
+        self.input_source.set_mouse((mouse_x, mouse_y), mouse_buttons)
+        self.frame_count += 1
+        return ReplayFrame(dt, (mouse_x, mouse_y), mouse_buttons, events)
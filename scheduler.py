@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from config import PARALLEL_SYSTEMS, SYSTEM_THREADS
+
+if TYPE_CHECKING:
+    from ecs import System
+    from game_state import GameState
+
+class SystemScheduler:
+    """Orders system updates by their declared reads/writes and runs independent systems together.
+
+    Two systems conflict when one writes something the other reads or writes. A conflicting
+    pair keeps the order of the systems dict; everything else is free to run in the same batch.
+    Entities added or removed during a parallel batch are applied after it, in the systems dict's order.
+    """
+    UNDECLARED = "<undeclared>"
+
+    def __init__(self, systems: dict[str, 'System'], run_system=None, state: 'GameState | None' = None,
+                 parallel: bool = PARALLEL_SYSTEMS, max_workers: int = SYSTEM_THREADS):
+        self.systems = systems
+        self.run_system = run_system  # GameState.run_system, so updates go through the profiler
+        self.state = state  # defers entity changes during parallel batches
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.executor: ThreadPoolExecutor | None = None
+        self.system_names: list[str] = []
+        self.dependencies: dict[str, set[str]] = {}
+        self.conflicts: list[tuple[str, str, set[str]]] = []
+        self.batches: list[list[str]] = []
+
+    def get_conflicts(self, system: 'System', other_system: 'System') -> set[str]:
+        if system.reads is None or system.writes is None or other_system.reads is None or other_system.writes is None:
+            return {self.UNDECLARED}
+        writes = set(system.writes)
+        other_writes = set(other_system.writes)
+        conflicts = writes & (set(other_system.reads) | other_writes)
+        conflicts |= other_writes & set(system.reads)
+        return conflicts
+
+    def build(self):
+        """Build the dependency DAG and group it into batches of mutually independent systems"""
+        self.system_names = list(self.systems)
+        self.dependencies = {name: set() for name in self.system_names}
+        self.conflicts = []
+        for index, name in enumerate(self.system_names):
+            for earlier_name in self.system_names[:index]:
+                conflicts = self.get_conflicts(self.systems[earlier_name], self.systems[name])
+                if conflicts:
+                    # Edges only point from earlier to later systems, so the graph can't have cycles
+                    self.dependencies[name].add(earlier_name)
+                    self.conflicts.append((earlier_name, name, conflicts))
+
+        batch_index: dict[str, int] = {}
+        for name in self.system_names:
+            batch_index[name] = max((batch_index[dependency] + 1 for dependency in self.dependencies[name]), default=0)
+        self.batches = [[] for _ in range(max(batch_index.values(), default=-1) + 1)]
+        for name in self.system_names:
+            self.batches[batch_index[name]].append(name)
+
+        undeclared = [name for name in self.system_names if self.systems[name].reads is None or self.systems[name].writes is None]
+        if undeclared:
+            print(f"Warning: systems without reads/writes run exclusively: {', '.join(undeclared)}")
+        print(f"Scheduled {len(self.system_names)} systems in {len(self.batches)} batches: {self.batches}")
+
+    def describe_conflicts(self) -> list[str]:
+        if self.system_names != list(self.systems):
+            self.build()
+        return [f"{first} -> {second}: {', '.join(sorted(conflicts))}" for first, second, conflicts in self.conflicts]
+
+    def update(self, dt):
+        if self.system_names != list(self.systems):
+            self.build()
+        for batch in self.batches:
+            due_systems = [self.systems[name] for name in batch if self.systems[name].is_due(dt)]
+            if self.parallel and len(due_systems) > 1:
+                executor = self.get_executor()
+                futures = [executor.submit(self.run_deferred_update, system) for system in due_systems]
+                # result() re-raises exceptions from the worker thread
+                changes = [future.result() for future in futures]
+                if self.state is not None:
+                    for system_changes in changes:
+                        self.state.apply_entity_changes(system_changes)
+            else:
+                for system in due_systems:
+                    self.run_update(system)
+
+    def run_update(self, system: 'System'):
+        # Systems that skipped steps receive all the time that passed since their last update
+        elapsed = system.consume_elapsed_time()
+        if self.run_system is None:
+            system.update(elapsed)
+        else:
+            self.run_system(system, "update", elapsed)
+
+    def run_deferred_update(self, system: 'System') -> list:
+        if self.state is None:
+            self.run_update(system)
+            return []
+        with self.state.defer_entity_changes() as changes:
+            self.run_update(system)
+        return changes
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="system")
+        return self.executor
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,307 @@
+import heapq
+import math
+from operator import itemgetter
+
+class KDNode:
+    __slots__ = ("x", "y", "item", "axis", "left", "right")
+
+    def __init__(self, point: tuple, axis: int, left: 'KDNode | None', right: 'KDNode | None'):
+        self.x, self.y, self.item = point
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+class NearestResults:
+    """Bounded max-heap of the k closest items seen so far"""
+    def __init__(self, k: int, max_distance: float):
+        self.k = k
+        self.max_distance_sq = max_distance * max_distance
+        self.heap: list[tuple[float, int, object]] = []
+        self.counter = 0  # tie breaker so the heap never compares items
+
+    def worst_distance_sq(self) -> float:
+        if len(self.heap) < self.k:
+            return self.max_distance_sq
+        return -self.heap[0][0]
+
+    def offer(self, item, distance_sq: float):
+        if distance_sq > self.worst_distance_sq():
+            return
+        self.counter += 1
+        entry = (-distance_sq, self.counter, item)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        else:
+            heapq.heapreplace(self.heap, entry)
+
+    def get_items(self) -> list:
+        return [item for _, _, item in sorted(self.heap, key=lambda entry: (-entry[0], entry[1]))]
+
+class KDTreeIndex:
+    """2D tree over items that rarely move (resources, buildings); rebuilt lazily on the first query after a change"""
+    def __init__(self):
+        self.positions: dict = {}  # item -> (x, y)
+        self.root: KDNode | None = None
+        self.dirty = False
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, item) -> bool:
+        return item in self.positions
+
+    def insert(self, item, x: float, y: float):
+        self.positions[item] = (x, y)
+        self.dirty = True
+
+    def move(self, item, x: float, y: float):
+        if self.positions.get(item) != (x, y):
+            self.insert(item, x, y)
+
+    def remove(self, item):
+        if self.positions.pop(item, None) is not None:
+            self.dirty = True
+
+    def get_position(self, item) -> tuple[float, float] | None:
+        return self.positions.get(item)
+
+    def rebuild(self):
+        points = [(x, y, item) for item, (x, y) in self.positions.items()]
+        self.root = self.build(points, 0)
+        self.dirty = False
+        self.rebuilds += 1
+
+    def build(self, points: list[tuple], depth: int) -> KDNode | None:
+        if not points:
+            return None
+        axis = depth % 2
+        points.sort(key=itemgetter(axis))
+        middle = len(points) // 2
+        return KDNode(points[middle], axis,
+                      self.build(points[:middle], depth + 1),
+                      self.build(points[middle + 1:], depth + 1))
+
+    def get_root(self) -> KDNode | None:
+        if self.dirty:
+            self.rebuild()
+        return self.root
+
+    def nearest(self, x: float, y: float, k: int = 1, max_distance: float = math.inf, predicate=None) -> list:
+        """Up to k items closest to (x, y), nearest first; `predicate` skips items without ending the search"""
+        results = NearestResults(k, max_distance)
+        # Entries carry a lower bound on the distance to anything under the node; the near side is pushed last
+        # so it is searched first, and the far side is usually pruned by the time it is popped
+        stack: list[tuple[KDNode | None, float]] = [(self.get_root(), 0.0)]
+        while stack:
+            node, bound_sq = stack.pop()
+            if node is None or bound_sq > results.worst_distance_sq():
+                continue
+            dx = x - node.x
+            dy = y - node.y
+            if predicate is None or predicate(node.item):
+                results.offer(node.item, dx * dx + dy * dy)
+            difference = dx if node.axis == 0 else dy
+            near, far = (node.left, node.right) if difference < 0 else (node.right, node.left)
+            stack.append((far, difference * difference))
+            stack.append((near, bound_sq))
+        return results.get_items()
+
+    def query_radius(self, x: float, y: float, radius: float) -> list:
+        radius_sq = radius * radius
+        found = []
+        stack = [self.get_root()]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            dx = x - node.x
+            dy = y - node.y
+            if dx * dx + dy * dy <= radius_sq:
+                found.append(node.item)
+            difference = dx if node.axis == 0 else dy
+            if difference <= radius:
+                stack.append(node.left)
+            if difference >= -radius:
+                stack.append(node.right)
+        return found
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> list:
+        found = []
+        stack = [self.get_root()]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if left <= node.x <= right and top <= node.y <= bottom:
+                found.append(node.item)
+            low, high, value = (left, right, node.x) if node.axis == 0 else (top, bottom, node.y)
+            if low <= value:
+                stack.append(node.left)
+            if value <= high:
+                stack.append(node.right)
+        return found
+
+class GridIndex:
+    """Uniform bucket grid for items that move every frame (enemies, workers); moves only touch two buckets"""
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], dict] = {}  # cell -> items in it (dict used as an ordered set)
+        self.positions: dict = {}  # item -> (x, y)
+        self.item_cells: dict = {}  # item -> cell
+        # Grows only, so it may overstate the occupied area after removals; only used to stop searches
+        self.min_cell: list[int] | None = None
+        self.max_cell: list[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, item) -> bool:
+        return item in self.positions
+
+    def get_cell(self, x: float, y: float) -> tuple[int, int]:
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, item, x: float, y: float):
+        cell = self.get_cell(x, y)
+        self.positions[item] = (x, y)
+        old_cell = self.item_cells.get(item)
+        if old_cell == cell:
+            return
+        if old_cell is not None:
+            self.remove_from_cell(item, old_cell)
+        self.item_cells[item] = cell
+        self.cells.setdefault(cell, {})[item] = None
+        if self.min_cell is None or self.max_cell is None:
+            self.min_cell = list(cell)
+            self.max_cell = list(cell)
+        else:
+            self.min_cell[0] = min(self.min_cell[0], cell[0])
+            self.min_cell[1] = min(self.min_cell[1], cell[1])
+            self.max_cell[0] = max(self.max_cell[0], cell[0])
+            self.max_cell[1] = max(self.max_cell[1], cell[1])
+
+    def move(self, item, x: float, y: float):
+        self.insert(item, x, y)
+
+    def remove(self, item):
+        cell = self.item_cells.pop(item, None)
+        if cell is None:
+            return
+        del self.positions[item]
+        self.remove_from_cell(item, cell)
+
+    def remove_from_cell(self, item, cell: tuple[int, int]):
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.pop(item, None)
+            if not bucket:
+                del self.cells[cell]
+
+    def get_position(self, item) -> tuple[float, float] | None:
+        return self.positions.get(item)
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> list:
+        left_cell, top_cell = self.get_cell(left, top)
+        right_cell, bottom_cell = self.get_cell(right, bottom)
+        found = []
+        for cell_y in range(top_cell, bottom_cell + 1):
+            for cell_x in range(left_cell, right_cell + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    x, y = self.positions[item]
+                    if left <= x <= right and top <= y <= bottom:
+                        found.append(item)
+        return found
+
+    def query_radius(self, x: float, y: float, radius: float) -> list:
+        radius_sq = radius * radius
+        found = []
+        for item in self.query_rect(x - radius, y - radius, x + radius, y + radius):
+            item_x, item_y = self.positions[item]
+            if (item_x - x) ** 2 + (item_y - y) ** 2 <= radius_sq:
+                found.append(item)
+        return found
+
+    def nearest(self, x: float, y: float, k: int = 1, max_distance: float = math.inf, predicate=None) -> list:
+        """Up to k items closest to (x, y), nearest first, searching outward ring by ring"""
+        results = NearestResults(k, max_distance)
+        if not self.positions or self.min_cell is None or self.max_cell is None:
+            return []
+        center_x, center_y = self.get_cell(x, y)
+        last_ring = max(center_x - self.min_cell[0], self.max_cell[0] - center_x,
+                        center_y - self.min_cell[1], self.max_cell[1] - center_y, 0)
+        if max_distance != math.inf:
+            last_ring = min(last_ring, int(max_distance // self.cell_size) + 1)
+        # Sparse grids have more empty cells than items; scanning the items directly is cheaper then
+        if (2 * last_ring + 1) ** 2 > 4 * len(self.positions):
+            for item, (item_x, item_y) in self.positions.items():
+                if predicate is None or predicate(item):
+                    results.offer(item, (item_x - x) ** 2 + (item_y - y) ** 2)
+            return results.get_items()
+
+        for ring in range(last_ring + 1):
+            for cell in self.get_ring_cells(center_x, center_y, ring):
+                bucket = self.cells.get(cell)
+                if not bucket:
+                    continue
+                for item in bucket:
+                    if predicate is None or predicate(item):
+                        item_x, item_y = self.positions[item]
+                        results.offer(item, (item_x - x) ** 2 + (item_y - y) ** 2)
+            # Anything in the next ring is at least `ring` whole cells away
+            reach = ring * self.cell_size
+            if len(results.heap) == results.k and results.worst_distance_sq() <= reach * reach:
+                break
+        return results.get_items()
+
+    def get_ring_cells(self, center_x: int, center_y: int, ring: int) -> list[tuple[int, int]]:
+        if ring == 0:
+            return [(center_x, center_y)]
+        cells = []
+        for cell_x in range(center_x - ring, center_x + ring + 1):
+            cells.append((cell_x, center_y - ring))
+            cells.append((cell_x, center_y + ring))
+        for cell_y in range(center_y - ring + 1, center_y + ring):
+            cells.append((center_x - ring, cell_y))
+            cells.append((center_x + ring, cell_y))
+        return cells
+
+class OccupancyGrid:
+    """Counts of blocking entities per cell of a fixed-size grid, for constant-time 'is this cell taken' checks"""
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self.counts: dict[tuple[int, int], int] = {}
+        self.version = 0  # bumped whenever a cell flips between free and occupied
+
+    def get_cell(self, x: float, y: float) -> tuple[int, int]:
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def get_cells_for_rect(self, x: float, y: float, width: float, height: float) -> list[tuple[int, int]]:
+        left, top = self.get_cell(x, y)
+        right, bottom = self.get_cell(x + max(width, 1) - 1, y + max(height, 1) - 1)
+        return [(cell_x, cell_y) for cell_y in range(top, bottom + 1) for cell_x in range(left, right + 1)]
+
+    def add(self, cells: list[tuple[int, int]]):
+        for cell in cells:
+            count = self.counts.get(cell, 0)
+            self.counts[cell] = count + 1
+            if count == 0:
+                self.version += 1
+
+    def remove(self, cells: list[tuple[int, int]]):
+        for cell in cells:
+            count = self.counts.get(cell, 0)
+            if count <= 1:
+                if self.counts.pop(cell, None) is not None:
+                    self.version += 1
+            else:
+                self.counts[cell] = count - 1
+
+    def is_free(self, cell: tuple[int, int]) -> bool:
+        return cell not in self.counts
+
+    def get_occupied_cells(self) -> list[tuple[int, int]]:
+        return list(self.counts)
@@ -0,0 +1,143 @@
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+import pygame as pg
+
+# File layout (little endian):
+#   header  MAGIC, version, flags, entry count, index size, stored blob size
+#   index   per sprite: ENTRY followed by the utf-8 name
+#   blob    every sprite's RGBA pixels back to back, zlib compressed when FLAG_ZLIB is set
+# Each entry records the source PNG's mtime, size and content hash so the cache is only rebuilt when a PNG changes.
+MAGIC = b"FGSC"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 1
+HEADER = struct.Struct("<4sHHIIQ")
+ENTRY = struct.Struct("<HqQ20sIIQ")  # name length, mtime_ns, file size, sha1, width, height, pixel offset
+DEFAULT_CACHE_PATH = "assets/cache/sprites.bin"
+
+class SourceFile:
+    def __init__(self, name: str, path: str, mtime_ns: int, size: int):
+        self.name = name
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+def scan_sources(folder: str) -> dict[str, SourceFile]:
+    """Every PNG in `folder` by sprite name, from a single directory listing"""
+    sources = {}
+    if not os.path.exists(folder):
+        return sources
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith(".png") and not entry.name.startswith(".") and entry.is_file():
+                stat = entry.stat()
+                sources[entry.name[:-4]] = SourceFile(entry.name[:-4], entry.path, stat.st_mtime_ns, stat.st_size)
+    return sources
+
+def hash_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+class SpriteCache:
+    """Every sprite's decoded pixels in one file, so startup is a single mmap instead of a PNG decode per sprite"""
+    def __init__(self, source_folder: str = "assets/sprites/", cache_path: str = DEFAULT_CACHE_PATH,
+                 compress: bool = False):
+        self.source_folder = source_folder
+        self.cache_path = cache_path
+        self.compress = compress  # zlib level 1: a smaller file for a little more load time
+
+    def load(self) -> dict[str, pg.Surface] | None:
+        """The cached sprites, or None when the cache is missing, unreadable or older than the PNGs"""
+        if not os.path.exists(self.cache_path):
+            return None
+        # convert_alpha requires a display surface
+        if not pg.get_init():
+            pg.init()
+        if not pg.display.get_surface():
+            pg.display.set_mode((1, 1))
+        try:
+            with open(self.cache_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                sprites, touched = self.read(data, scan_sources(self.source_folder))
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            print(f"Ignoring unreadable sprite cache {self.cache_path}: {e}")
+            return None
+        if touched:
+            self.write(sprites)  # Same pixels, new mtimes: refresh the index so the files aren't hashed again
+        return sprites
+
+    def read(self, data: mmap.mmap, sources: dict[str, SourceFile]) -> tuple[dict[str, pg.Surface] | None, bool]:
+        magic, version, flags, count, index_size, blob_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or count != len(sources):
+            return None, False
+        entries = []
+        touched = False
+        position = HEADER.size
+        for _ in range(count):
+            name_length, mtime_ns, size, digest, width, height, offset = ENTRY.unpack_from(data, position)
+            position += ENTRY.size
+            name = data[position:position + name_length].decode("utf-8")
+            position += name_length
+            source = sources.get(name)
+            if source is None or source.size != size:
+                return None, False
+            if source.mtime_ns != mtime_ns:
+                # Touched but maybe not changed (a checkout, a copy): only the content hash decides
+                if hash_file(source.path) != digest:
+                    return None, False
+                touched = True
+            entries.append((name, width, height, offset))
+
+        blob_start = HEADER.size + index_size
+        if flags & FLAG_ZLIB:
+            blob = memoryview(zlib.decompress(data[blob_start:blob_start + blob_size]))
+        else:
+            blob = memoryview(data)[blob_start:blob_start + blob_size]
+        sprites = {}
+        surfaces: dict[tuple[int, int, int], pg.Surface] = {}  # names sharing pixels share one surface
+        with blob:
+            for name, width, height, offset in entries:
+                key = (offset, width, height)
+                if key not in surfaces:
+                    with blob[offset:offset + width * height * 4] as pixels:
+                        # convert_alpha copies the pixels, so no surface keeps a view into the mapping
+                        surfaces[key] = pg.image.frombuffer(pixels, (width, height), "RGBA").convert_alpha()
+                sprites[name] = surfaces[key]
+        return sprites, touched
+
+    def write(self, sprites: dict[str, pg.Surface]):
+        """Cache `sprites`, which must be the decoded contents of the source folder's PNGs"""
+        sources = scan_sources(self.source_folder)
+        index = []
+        pixel_chunks = []
+        pixel_offsets: dict[bytes, int] = {}  # identical images are stored once and share an offset
+        offset = 0
+        for name in sorted(sprites):
+            source = sources.get(name)
+            if source is None:
+                continue
+            surface = sprites[name]
+            pixels = pg.image.tostring(surface, "RGBA")
+            if pixels not in pixel_offsets:
+                pixel_offsets[pixels] = offset
+                pixel_chunks.append(pixels)
+                offset += len(pixels)
+            name_bytes = name.encode("utf-8")
+            index.append(ENTRY.pack(len(name_bytes), source.mtime_ns, source.size, hash_file(source.path),
+                                    surface.get_width(), surface.get_height(), pixel_offsets[pixels]) + name_bytes)
+        if len(index) != len(sources):
+            return  # Some PNG failed to decode; a partial cache would never validate
+        blob = b"".join(pixel_chunks)
+        flags = 0
+        if self.compress:
+            blob = zlib.compress(blob, 1)
+            flags |= FLAG_ZLIB
+        index_bytes = b"".join(index)
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(index), len(index_bytes), len(blob)))
+            f.write(index_bytes)
+            f.write(blob)
+        os.replace(temp_path, self.cache_path)
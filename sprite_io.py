@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+import pygame as pg
+
+# Called on the submitting thread as (finished, total) after every image
+ProgressCallback = Callable[[int, int], None]
+
+def save_image(sprite: pg.Surface, file_path: str):
+    """Encode to a temp file next to the target and rename it over, so a crash never leaves a half-written image"""
+    folder, file_name = os.path.split(file_path)
+    # pygame picks the encoder from the extension, so the temp name keeps it
+    temp_path = os.path.join(folder, f".{file_name}.tmp{os.path.splitext(file_name)[1]}")
+    pg.image.save(sprite, temp_path)
+    os.replace(temp_path, file_path)
+
+def save_images(jobs: list[tuple[pg.Surface, str]], max_workers: int | None = None,
+                progress: ProgressCallback | None = None) -> list[tuple[str, Exception]]:
+    """Encode and write (surface, path) pairs on a thread pool; returns the paths that failed"""
+    failures = []
+    if not jobs:
+        return failures
+    # pygame releases the GIL while it compresses and writes a file given by path
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sprite-save") as executor:
+        futures = {executor.submit(save_image, sprite, file_path): file_path for sprite, file_path in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                future.result()
+            except Exception as e:
+                failures.append((futures[future], e))
+            if progress is not None:
+                progress(done, len(jobs))
+    return failures
+
+def load_images(file_paths: list[str], max_workers: int | None = None,
+                progress: ProgressCallback | None = None) -> tuple[dict[str, pg.Surface], list[tuple[str, Exception]]]:
+    """Decode image files on a thread pool; returns unconverted surfaces by path and the paths that failed.
+    convert_alpha is left to the caller because it needs the display on the main thread."""
+    images = {}
+    failures = []
+    if not file_paths:
+        return images, failures
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sprite-load") as executor:
+        futures = {executor.submit(pg.image.load, file_path): file_path for file_path in file_paths}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                images[futures[future]] = future.result()
+            except Exception as e:
+                failures.append((futures[future], e))
+            if progress is not None:
+                progress(done, len(file_paths))
+    return images, failures
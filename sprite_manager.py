@@ -1,24 +1,66 @@
 from turtle import back
+from collections import OrderedDict
+import hashlib
+import os
 import pygame as pg
+from sprite_cache import SpriteCache
+from sprite_io import ProgressCallback, load_images, save_images
 
 class SpriteManager:
+    # Sprites decoded once (by AssetLoader or the first SpriteManager) and shared by every later instance
+    shared_sprites: dict[str, pg.Surface] | None = None
+    # Scaled/flipped/rotated copies shared by every instance, least recently used first; each entry keeps
+    # the surface it was made from so an edited sprite never gets a stale variant
+    variant_cache: OrderedDict[tuple, tuple[pg.Surface, pg.Surface]] = OrderedDict()
+    variant_cache_bytes = 0
+    max_variant_cache_bytes = 32 * 1024 * 1024
+
     def __init__(self):
         self.default_file_name = "sprites.pkl"
         self.backup_file_name = "sprites_backup.pkl"
-        self.sprites : dict[str, pg.Surface] = self.get_default_saved_sprites()
-        self.sprites : dict[str, pg.Surface] = self.remap_sprites(self.sprites)
+        if SpriteManager.shared_sprites is None:
+            SpriteManager.set_shared_sprites(self.remap_sprites(self.get_default_saved_sprites()))
+        self.sprites : dict[str, pg.Surface] = dict(SpriteManager.shared_sprites)
+        # Folder -> sprites added or changed since the last save there; folders not in it get every sprite written
+        self.dirty_sprites: dict[str, set[str]] = {os.path.normpath("assets/sprites/"): set()}
+        # Content hash index, built on the first edit: identical images are stored once behind every name
+        self.sprite_hashes: dict[str, bytes] | None = None  # sprite name -> pixel hash
+        self.unique_sprites: dict[bytes, pg.Surface] = {}
+        self.hash_counts: dict[bytes, int] = {}  # names sharing each unique surface
         self.player_sprite_names = ["north", "south", "east", "west"]
         
         self.gui = None
 
+    @classmethod
+    def set_shared_sprites(cls, sprites: dict[str, pg.Surface]):
+        unique_sprites: dict[bytes, pg.Surface] = {}
+        cls.shared_sprites = {name: unique_sprites.setdefault(cls.get_pixel_hash(sprite), sprite)
+                              for name, sprite in sprites.items()}
+
+    @staticmethod
+    def get_pixel_hash(sprite: pg.Surface) -> bytes:
+        pixel_hash = hashlib.blake2b(digest_size=16)
+        pixel_hash.update(str(sprite.get_size()).encode())
+        pixel_hash.update(pg.image.tostring(sprite, "RGBA"))
+        return pixel_hash.digest()
+
+    @staticmethod
+    def is_fully_transparent(sprite: pg.Surface) -> bool:
+        # Threshold 0 sets a mask bit for any pixel with some alpha (or not matching the colorkey)
+        return pg.mask.from_surface(sprite, 0).count() == 0
+
     def remap_sprites(self, sprites: dict[str, pg.Surface]) -> dict[str, pg.Surface]:
         # Remapping logic (identity mapping here)
         remapped_sprites = sprites
         return remapped_sprites
 
     def get_default_saved_sprites(self) -> dict[str, pg.Surface]:
-        sprites : dict[str, pg.Surface] = {}
-        sprites = self.load_sprite_data()
+        sprite_cache = SpriteCache()
+        sprites = sprite_cache.load()
+        if sprites is None:
+            sprites = self.load_sprite_data()
+            if sprites:
+                sprite_cache.write(sprites)
         if sprites == {}:
             # If no PNGs are present, try loading from backup pickle
             sprites = self.load_backup_sprite_data()
@@ -38,7 +80,7 @@ class SpriteManager:
             pg.display.set_mode((1, 1))
 
         for file_name in os.listdir(file_path):
-            if file_name.endswith(".png"):
+            if file_name.endswith(".png") and not file_name.startswith("."):  # Dot files are unfinished saves
                 sprite_name = file_name[:-4]  # Remove .png extension
                 full_path = os.path.join(file_path, file_name)
                 try:
@@ -58,31 +100,97 @@ class SpriteManager:
         if not pg.display.get_surface():
             pg.display.set_mode((1, 1))  # Minimal display for image operations
         sprite = pg.image.load(file_path).convert_alpha()
-        self.sprites[name] = sprite
+        self.add_sprite(name, sprite)
         
-    def load_sprite_list_from_files(self, sprite_list: dict[str, str]):
+    def load_sprite_list_from_files(self, sprite_list: dict[str, str],
+                                    progress: ProgressCallback | None = None) -> list[tuple[str, Exception]]:
+        """Decode the files in parallel and add them as sprites; returns the files that failed"""
         # Ensure pygame is initialized with video mode
         if not pg.get_init():
             pg.init()
         if not pg.display.get_surface():
             pg.display.set_mode((1, 1))  # Minimal display for image operations
+        images, failures = load_images(list(set(sprite_list.values())), progress=progress)
         for name, file_path in sprite_list.items():
-            sprite = pg.image.load(file_path).convert_alpha()
-            self.sprites[name] = sprite
+            if file_path in images:
+                self.add_sprite(name, images[file_path].convert_alpha())
+        return failures
             
     def RunSpriteManagerGUI(self):
         if self.gui is None:
             import sprite_manager_gui
             self.gui = sprite_manager_gui.SpriteManagerGUI(self)
 
+    def get_hash_index(self) -> dict[str, bytes]:
+        if self.sprite_hashes is None:
+            self.sprite_hashes = {}
+            for name, sprite in self.sprites.items():
+                self.index_sprite(name, sprite)
+        return self.sprite_hashes
+
+    def index_sprite(self, name: str, sprite: pg.Surface) -> pg.Surface:
+        """Record the sprite's hash and return the surface already stored for those pixels, if any"""
+        pixel_hash = self.get_pixel_hash(sprite)
+        sprite = self.unique_sprites.setdefault(pixel_hash, sprite)
+        self.hash_counts[pixel_hash] = self.hash_counts.get(pixel_hash, 0) + 1
+        self.sprite_hashes[name] = pixel_hash
+        return sprite
+
+    def unindex_sprite(self, name: str):
+        pixel_hash = self.sprite_hashes.pop(name, None)
+        if pixel_hash is None:
+            return
+        self.hash_counts[pixel_hash] -= 1
+        if self.hash_counts[pixel_hash] == 0:
+            del self.hash_counts[pixel_hash]
+            del self.unique_sprites[pixel_hash]
+
     def add_sprite(self, name: str, sprite: pg.Surface):
-        self.sprites[name] = sprite
+        self.get_hash_index()
+        self.unindex_sprite(name)
+        self.sprites[name] = self.index_sprite(name, sprite)
+        for dirty_sprites in self.dirty_sprites.values():
+            dirty_sprites.add(name)
 
     def get_sprite(self, name: str) -> pg.Surface:
         default_sprite = pg.Surface((50, 50))
         default_sprite.fill((255, 0, 255))  # Magenta for missing sprite
         return self.sprites.get(name, default_sprite)
 
+    def get_sprite_variant(self, name: str, size: tuple[int, int] | None = None, flip_x: bool = False,
+                           flip_y: bool = False, rotation: float = 0) -> pg.Surface:
+        """The named sprite scaled to `size`, then flipped, then rotated by `rotation` degrees; made once and
+        shared, so callers must not draw on it"""
+        source = self.get_sprite(name)
+        key = (name, tuple(size) if size is not None else None, flip_x, flip_y, rotation)
+        cached = SpriteManager.variant_cache.get(key)
+        if cached is not None and (cached[0] is source or name not in self.sprites):
+            SpriteManager.variant_cache.move_to_end(key)
+            return cached[1]
+
+        variant = source
+        if size is not None and tuple(size) != source.get_size():
+            variant = pg.transform.scale(variant, size)
+        if flip_x or flip_y:
+            variant = pg.transform.flip(variant, flip_x, flip_y)
+        if rotation:
+            variant = pg.transform.rotate(variant, rotation)
+        if variant is source:
+            return source
+        if cached is not None:
+            SpriteManager.variant_cache_bytes -= self.get_surface_bytes(cached[1])
+        SpriteManager.variant_cache[key] = (source, variant)
+        SpriteManager.variant_cache.move_to_end(key)
+        SpriteManager.variant_cache_bytes += self.get_surface_bytes(variant)
+        while SpriteManager.variant_cache_bytes > SpriteManager.max_variant_cache_bytes and len(SpriteManager.variant_cache) > 1:
+            _, (_, evicted) = SpriteManager.variant_cache.popitem(last=False)
+            SpriteManager.variant_cache_bytes -= self.get_surface_bytes(evicted)
+        return variant
+
+    @staticmethod
+    def get_surface_bytes(surface: pg.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
     def get_sprite_set(self, base_name: str) -> list[pg.Surface]:
         sprite_set = []
         for key in self.sprites.keys():
@@ -92,31 +200,52 @@ class SpriteManager:
 
     def remove_sprite(self, name: str):
         if name in self.sprites:
+            self.get_hash_index()
+            self.unindex_sprite(name)
             del self.sprites[name]
+            for dirty_sprites in self.dirty_sprites.values():
+                dirty_sprites.discard(name)
+
+    def clear_sprites(self):
+        self.sprites.clear()
+        for dirty_sprites in self.dirty_sprites.values():
+            dirty_sprites.clear()
+        self.sprite_hashes = None
+        self.unique_sprites.clear()
+        self.hash_counts.clear()
             
-    def save_sprite_data(self, file_path: str="assets/sprites/"):
+    def save_sprite_data(self, file_path: str="assets/sprites/", progress: ProgressCallback | None = None):
         import os
         if os.path.exists(file_path) == False:
             os.makedirs(file_path)
 
+        existing_files = set(os.listdir(file_path))
+        self.check_for_unwanted_files(file_path, existing_files)
+        dirty_sprites = self.dirty_sprites.get(os.path.normpath(file_path))
+        jobs = []
         for sprite_name, sprite in self.sprites.items():
-            self.check_for_unwanted_files()
-            if isinstance(sprite_name, str) and isinstance(sprite, pg.Surface):
-                check_for_existing = os.path.join(file_path, f"{sprite_name}.png")
-                if os.path.exists(check_for_existing):
-                    os.remove(check_for_existing)
-                    print(f"Overwriting existing sprite file: {check_for_existing}")
-                pg.image.save(sprite, f"{file_path}/{sprite_name}.png")  # Save individual sprite as image file
-            else:
+            if not isinstance(sprite_name, str) or not isinstance(sprite, pg.Surface):
                 print(f"Skipping invalid sprite entry: {sprite_name, sprite}")
+                continue
+            # Only sprites changed since the last save to this folder, or missing from it, are written
+            if dirty_sprites is not None and sprite_name not in dirty_sprites and f"{sprite_name}.png" in existing_files:
+                continue
+            jobs.append((sprite, os.path.join(file_path, f"{sprite_name}.png")))
+        # Encoded in parallel, each to a temp file renamed into place
+        failures = save_images(jobs, progress=progress)
+        for failed_path, e in failures:
+            print(f"Failed to save sprite file {failed_path}: {e}")
+        failed_names = {os.path.basename(failed_path)[:-4] for failed_path, _ in failures}
+        self.dirty_sprites[os.path.normpath(file_path)] = failed_names  # Failed sprites stay dirty for the next save
 
-    def check_for_unwanted_files(self):
+    def check_for_unwanted_files(self, file_path: str="assets/sprites/", existing_files: set[str] | None = None):
+        """Delete PNGs of sprites that are no longer registered, including temp files left by an interrupted save"""
         import os
-        list_of_all_existing_files = os.listdir("assets/sprites/") # List all files in the sprites directory
-        list_of_current_sprite_files = [f"{sprite_name}.png" for sprite_name in self.sprites.keys()] # Current sprite file names
-        for existing_file in list_of_all_existing_files:
-            if existing_file not in list_of_current_sprite_files:
-                unwanted_path = os.path.join("assets/sprites/", existing_file)
+        if existing_files is None:
+            existing_files = set(os.listdir(file_path))
+        for existing_file in existing_files:
+            if existing_file.endswith(".png") and existing_file[:-4] not in self.sprites:
+                unwanted_path = os.path.join(file_path, existing_file)
                 os.remove(unwanted_path)
                 print(f"Removed outdated sprite file: {unwanted_path}")
 
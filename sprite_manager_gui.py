@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, colorchooser, messagebox, simpledialog
 from PIL import Image, ImageTk
 import os
+from sprite_io import save_images
 
 class SpriteManagerGUI:
     def __init__(self, sprite_manager):
@@ -653,19 +654,23 @@ class SpriteManagerGUI:
         )
         
         if file_paths:
-            loaded = 0
+            sprite_list = {}
             for file_path in file_paths:
-                name = os.path.splitext(os.path.basename(file_path))[0]
-                name = self.get_unique_name(name)
-                
-                try:
-                    self.sprite_manager.load_sprite_from_file(name, file_path)
-                    loaded += 1
-                except Exception as e:
-                    messagebox.showwarning("Warning", f"Failed to load {file_path}: {str(e)}")
+                base_name = os.path.splitext(os.path.basename(file_path))[0]
+                name = self.get_unique_name(base_name)
+                counter = 1
+                while name in sprite_list:  # Same file name picked from two folders
+                    name = self.get_unique_name(f"{base_name}_{counter}")
+                    counter += 1
+                sprite_list[name] = file_path
+            
+            # Decoded in parallel; convert_alpha and registration happen back on this thread
+            failures = self.sprite_manager.load_sprite_list_from_files(sprite_list, progress=self.show_progress("Loading"))
+            if failures:
+                messagebox.showwarning("Warning", "Failed to load:\n" + "\n".join(f"{path}: {e}" for path, e in failures))
             
             self.refresh_sprite_list()
-            messagebox.showinfo("Success", f"Loaded {loaded} sprite(s)")
+            messagebox.showinfo("Success", f"Loaded {len(sprite_list) - len(failures)} sprite(s)")
     
     def export_sprite(self):
         """Export selected sprite to file"""
@@ -940,7 +945,7 @@ class SpriteManagerGUI:
             return
         
         if messagebox.askyesno("Confirm Clear", "Delete all sprites? This cannot be undone."):
-            self.sprite_manager.sprites.clear()
+            self.sprite_manager.clear_sprites()
             self.selected_sprite = None
             self.preview_canvas.delete("all")
             self.info_label.config(text="No sprite selected")
@@ -993,7 +998,7 @@ class SpriteManagerGUI:
         # Dialog for spritesheet settings
         dialog = tk.Toplevel(self.root)
         dialog.title("Spritesheet Settings")
-        dialog.geometry("350x250")
+        dialog.geometry("350x290")
         dialog.transient(self.root)
         dialog.grab_set()
         
@@ -1021,6 +1026,9 @@ class SpriteManagerGUI:
         v_spacing_var = tk.IntVar(value=0)
         ttk.Spinbox(dialog, from_=0, to=100, textvariable=v_spacing_var).grid(row=5, column=1, padx=5, pady=5, sticky="ew")
         
+        skip_transparent_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(dialog, text="Skip fully transparent cells", variable=skip_transparent_var).grid(row=6, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        
         def split_sheet():
             sprite_width = sprite_width_var.get()
             sprite_height = sprite_height_var.get()
@@ -1032,6 +1040,7 @@ class SpriteManagerGUI:
             rows = (sheet_height + v_spacing) // (sprite_height + v_spacing)
             
             count = 0
+            skipped = 0
             for row in range(rows):
                 for col in range(cols):
                     x = col * (sprite_width + h_spacing)
@@ -1040,17 +1049,20 @@ class SpriteManagerGUI:
                     # Extract sprite
                     sprite = pg.Surface((sprite_width, sprite_height), pg.SRCALPHA)
                     sprite.blit(spritesheet, (0, 0), (x, y, sprite_width, sprite_height))
+                    if skip_transparent_var.get() and self.sprite_manager.is_fully_transparent(sprite):
+                        skipped += 1
+                        continue
                     
-                    # Add to manager
+                    # Add to manager (identical cells end up sharing one surface)
                     sprite_name = self.get_unique_name(f"{base_name}_{count}")
                     self.sprite_manager.add_sprite(sprite_name, sprite)
                     count += 1
             
             self.refresh_sprite_list()
             dialog.destroy()
-            messagebox.showinfo("Success", f"Split spritesheet into {count} sprites")
+            messagebox.showinfo("Success", f"Split spritesheet into {count} sprites ({skipped} empty cells skipped)")
         
-        ttk.Button(dialog, text="Split", command=split_sheet).grid(row=6, column=0, columnspan=2, pady=15)
+        ttk.Button(dialog, text="Split", command=split_sheet).grid(row=7, column=0, columnspan=2, pady=15)
         dialog.columnconfigure(1, weight=1)
     
     def export_all_sprites(self):
@@ -1060,16 +1072,20 @@ class SpriteManagerGUI:
         if not folder_path:
             return
         
-        exported = 0
-        for name, sprite in self.sprite_manager.sprites.items():
-            try:
-                file_path = os.path.join(folder_path, f"{name}.png")
-                pg.image.save(sprite, file_path)
-                exported += 1
-            except Exception as e:
-                messagebox.showwarning("Warning", f"Failed to export {name}: {str(e)}")
+        jobs = [(sprite, os.path.join(folder_path, f"{name}.png")) for name, sprite in self.sprite_manager.sprites.items()]
+        failures = save_images(jobs, progress=self.show_progress("Exporting"))
+        if failures:
+            messagebox.showwarning("Warning", "Failed to export:\n" + "\n".join(f"{path}: {e}" for path, e in failures))
+        self.refresh_sprite_list()
         
-        messagebox.showinfo("Success", f"Exported {exported} sprite(s) to {folder_path}")
+        messagebox.showinfo("Success", f"Exported {len(jobs) - len(failures)} sprite(s) to {folder_path}")
+    
+    def show_progress(self, action):
+        """Progress callback for bulk image IO that reports in the sprite count label"""
+        def progress(done, total):
+            self.count_label.config(text=f"{action} sprites: {done}/{total}")
+            self.root.update_idletasks()
+        return progress
     
     def split_sprite(self):
         """Split selected sprite into multiple parts with visual guide"""
@@ -1093,6 +1109,8 @@ class SpriteManagerGUI:
                         y = row * piece_height
                         piece = pg.Surface((piece_width, piece_height), pg.SRCALPHA)
                         piece.blit(sprite, (0, 0), (x, y, piece_width, piece_height))
+                        if skip_transparent_var.get() and self.sprite_manager.is_fully_transparent(piece):
+                            continue
                         name = self.get_unique_name(f"{self.selected_sprite}_{piece_count}")
                         self.sprite_manager.add_sprite(name, piece)
                         piece_count += 1
@@ -1112,6 +1130,8 @@ class SpriteManagerGUI:
                         y = row * (ph + v_space)
                         piece = pg.Surface((pw, ph), pg.SRCALPHA)
                         piece.blit(sprite, (0, 0), (x, y, pw, ph))
+                        if skip_transparent_var.get() and self.sprite_manager.is_fully_transparent(piece):
+                            continue
                         name = self.get_unique_name(f"{self.selected_sprite}_{piece_count}")
                         self.sprite_manager.add_sprite(name, piece)
                         piece_count += 1
@@ -1123,6 +1143,8 @@ class SpriteManagerGUI:
                     h = y2 - y1
                     piece = pg.Surface((w, h), pg.SRCALPHA)
                     piece.blit(sprite, (0, 0), (x1, y1, w, h))
+                    if skip_transparent_var.get() and self.sprite_manager.is_fully_transparent(piece):
+                        continue
                     name = self.get_unique_name(f"{self.selected_sprite}_{i}")
                     self.sprite_manager.add_sprite(name, piece)
                     piece_count += 1
@@ -1227,6 +1249,8 @@ class SpriteManagerGUI:
         ttk.Label(right_frame, text="Output:", font=('TkDefaultFont', 10, 'bold')).pack(anchor="w", pady=(5, 2))
         keep_original_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(right_frame, text="Keep Original", variable=keep_original_var).pack(anchor="w", padx=20)
+        skip_transparent_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(right_frame, text="Skip Fully Transparent Pieces", variable=skip_transparent_var).pack(anchor="w", padx=20)
         
         # Preview info label
         info_label = ttk.Label(right_frame, text="Pieces: 0", foreground="blue")
@@ -1445,6 +1469,8 @@ class SpriteManagerGUI:
                         y = row * piece_height
                         piece = pg.Surface((piece_width, piece_height), pg.SRCALPHA)
                         piece.blit(sprite, (0, 0), (x, y, piece_width, piece_height))
+                        if skip_transparent_var.get() and self.sprite_manager.is_fully_transparent(piece):
+                            continue
                         piece_name = self.get_unique_name(f"{self.selected_sprite}_r{row}_c{col}")
                         self.sprite_manager.add_sprite(piece_name, piece)
                         count += 1
@@ -1463,9 +1489,10 @@ class SpriteManagerGUI:
                     while x + piece_w <= width:
                         piece = pg.Surface((piece_w, piece_h), pg.SRCALPHA)
                         piece.blit(sprite, (0, 0), (x, y, piece_w, piece_h))
-                        piece_name = self.get_unique_name(f"{self.selected_sprite}_{count}")
-                        self.sprite_manager.add_sprite(piece_name, piece)
-                        count += 1
+                        if not (skip_transparent_var.get() and self.sprite_manager.is_fully_transparent(piece)):
+                            piece_name = self.get_unique_name(f"{self.selected_sprite}_{count}")
+                            self.sprite_manager.add_sprite(piece_name, piece)
+                            count += 1
                         x += piece_w + h_space
                         col += 1
                     y += piece_h + v_space
@@ -1478,6 +1505,8 @@ class SpriteManagerGUI:
                     piece_h = y2 - y1
                     piece = pg.Surface((piece_w, piece_h), pg.SRCALPHA)
                     piece.blit(sprite, (0, 0), (x1, y1, piece_w, piece_h))
+                    if skip_transparent_var.get() and self.sprite_manager.is_fully_transparent(piece):
+                        continue
                     piece_name = self.get_unique_name(f"{self.selected_sprite}_part{i}")
                     self.sprite_manager.add_sprite(piece_name, piece)
                     count += 1
@@ -11,6 +11,7 @@ class StateManager:
         self.previously_paused = False
         self.current_state: GameState = initial_state
         self.states: list[GameState] = [initial_state]
+        initial_state.state_manager = self
         self.current_state.enter()
         self.is_quit_message_shown = False
         self.font_small = self.init_font(24)
@@ -26,6 +27,7 @@ class StateManager:
             return pg.font.Font(None, size)
 
     def add_state(self, new_state: GameState):
+        new_state.state_manager = self
         self.states.append(new_state)
         
     def set_current_state(self, new_state: GameState):
@@ -68,6 +70,9 @@ class StateManager:
     def update(self, dt):
         if not self.is_paused:
             self.current_state.update(dt)
+
+    def set_interpolation_alpha(self, alpha: float):
+        self.current_state.interpolation_alpha = alpha
     
     def handle_quit(self):
         if not self.is_quit_message_shown:
@@ -84,8 +89,9 @@ class StateManager:
         text_rect = text_surf.get_rect(center=(message_box.get_width() // 2, 80))
         message_box.blit(text_surf, text_rect)
 
-        yes_button_color = (27, 100, 27) if self.yes_button.collidepoint(pg.mouse.get_pos()[0] - (SCREEN_WIDTH // 2 - 200), pg.mouse.get_pos()[1] - (SCREEN_HEIGHT // 2 - 100)) else (27, 150, 27)
-        no_button_color = (100, 27, 27) if self.no_button.collidepoint(pg.mouse.get_pos()[0] - (SCREEN_WIDTH // 2 - 200), pg.mouse.get_pos()[1] - (SCREEN_HEIGHT // 2 - 100)) else (150, 27, 27)
+        mouse_pos = self.current_state.input_source.get_mouse_position()
+        yes_button_color = (27, 100, 27) if self.yes_button.collidepoint(mouse_pos[0] - (SCREEN_WIDTH // 2 - 200), mouse_pos[1] - (SCREEN_HEIGHT // 2 - 100)) else (27, 150, 27)
+        no_button_color = (100, 27, 27) if self.no_button.collidepoint(mouse_pos[0] - (SCREEN_WIDTH // 2 - 200), mouse_pos[1] - (SCREEN_HEIGHT // 2 - 100)) else (150, 27, 27)
 
         pg.draw.rect(message_box, yes_button_color, self.yes_button, border_radius=5)
         pg.draw.rect(message_box, no_button_color, self.no_button, border_radius=5)
@@ -111,7 +117,7 @@ class StateManager:
                 self.no_button.x + (SCREEN_WIDTH // 2 - 200), 
                 self.no_button.y + (SCREEN_HEIGHT // 2 - 100), 
                 self.no_button.width, self.no_button.height)
-            mouse_pos = pg.mouse.get_pos()
+            mouse_pos = self.current_state.input_source.get_mouse_position()
             print(mouse_pos, yes_button_screen_pos, no_button_screen_pos)
             if yes_button_screen_pos.collidepoint(mouse_pos):
                 return True
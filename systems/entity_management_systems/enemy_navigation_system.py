@@ -0,0 +1,53 @@
+from ecs import System
+from game_state import GameState
+from navigation.flow_field import FlowField
+
+class EnemyNavigationSystem(System):
+    def __init__(self, state: GameState):
+        super().__init__(state)
+        self.required_components: list[str] = ['EnemyComponent', 'PositionComponent', 'SizeComponent', 'VelocityComponent']
+        self.reads = ['EnemyComponent', 'PositionComponent', 'SizeComponent', 'ControllableComponent']
+        self.writes = ['VelocityComponent']
+        self.enemy_speed = 40  # Units per second
+        # One field towards the player is shared by every enemy, so pathing cost doesn't grow with the wave size
+        self.flow_field: FlowField | None = None
+
+    def find_target(self):
+        for entity in self.state.entities:
+            if entity.has_components(['ControllableComponent', 'PositionComponent']):
+                return entity
+        for entity in self.state.entities:
+            if entity.name.lower().startswith("player") and entity.has_components(['PositionComponent', 'SizeComponent']):
+                return entity
+        return None
+
+    def update(self, dt):
+        grid = self.state.navigation_grid
+        target = self.find_target()
+        if grid is None or target is None:
+            return
+        if self.flow_field is None or self.flow_field.grid is not grid:
+            self.flow_field = FlowField(grid)
+        target_center = self.get_center(target) if target.has_components(['SizeComponent']) else self.get_position(target)
+        goal_cell = grid.world_to_cell(*target_center)
+        self.flow_field.update(goal_cell)
+
+        for entity in self.state.entities:
+            if entity.has_components(self.required_components):
+                self.steer_enemy(entity, grid, goal_cell, target_center)
+
+    def steer_enemy(self, entity, grid, goal_cell, target_center):
+        center = self.get_center(entity)
+        cell = grid.world_to_cell(*center)
+        direction_x, direction_y = self.flow_field.get_direction(*cell)
+        if cell == goal_cell or (direction_x == 0 and direction_y == 0):
+            # In the player's cell, or somewhere the field can't reach: head straight for the player
+            direction_x = target_center[0] - center[0]
+            direction_y = target_center[1] - center[1]
+            length = (direction_x ** 2 + direction_y ** 2) ** 0.5
+            if length < 1:
+                self.set_velocity(entity, (0, 0))
+                return
+            direction_x /= length
+            direction_y /= length
+        self.set_velocity(entity, (direction_x * self.enemy_speed, direction_y * self.enemy_speed))
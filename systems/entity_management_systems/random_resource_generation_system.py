@@ -1,24 +1,74 @@
 from turtle import st
 from ecs import System, Entity, Component
 from game_state import GameState
+import pygame as pg
 import random   
 from factory.resource_factory import ResourceFactory
+from factory.spawn_service import SpawnService
 
 class RandomResourceGenerationSystem(System):
     def __init__(self, state: GameState):
         super().__init__(state)
-        self.resource_factory = ResourceFactory()
+        # Spawn cells come from the tile grid loaded by MapLoadingSystem, which must be initialized first
+        map_loading_system = state.systems["MapLoadingSystem"]
+        map_data = map_loading_system.map_data
+        tile_size = map_loading_system.tile_size
+        map_area = pg.Rect(0, 0, len(map_data[0]) * tile_size if len(map_data) else 0, len(map_data) * tile_size)
+        self.resource_factory = ResourceFactory(seed=state.random_seed, spawn_area=map_area)
+        # Only cells whose tile is loaded can be drawn: a chunk's generated trees and stones are placed on
+        # its first load, so anything spawned into the rest of the map could end up underneath one of them
+        self.spawn_service = SpawnService(map_data, tile_size, seed=state.random_seed, min_spacing=1, active=False)
+        self.blocking_components: list[str] = ['ResourceComponent', 'TowerComponent', 'FactoryComponent']
+        self.reserved_cells: dict = {}  # entity -> spawn cells it keeps out of the free set
+        self.reads = ['ResourceData', 'PositionComponent', 'SizeComponent', 'TowerComponent', 'FactoryComponent', 'TileComponent']
+        self.writes = ['ResourceComponent']
         self.spawn_interval = 1.0  # seconds
-        self.time_since_last_spawn = 0.0
+        self.update_interval = self.spawn_interval  # Scheduled on its own timer, every update is a spawn
         state.max_resource_data = {"wood": 50, "stone": 30, "water": 20, "food": 40}
         state.resource_data = {"wood": 0, "stone": 0, "water": 0, "food": 0}
+        for entity in self.state.entities:
+            self.on_entity_added(entity)
+
+    def on_entity_added(self, entity):
+        if entity.has_components(['TileComponent', 'PositionComponent']):
+            self.spawn_service.set_active(self.get_tile_cell(entity), True)
+            return
+        if not entity.has_components(['PositionComponent', 'SizeComponent']):
+            return
+        if not any(entity.has_components([component]) for component in self.blocking_components):
+            return
+        position = self.get_position(entity)
+        size = self.get_size(entity)
+        cells = self.spawn_service.get_cells_for_rect(position[0], position[1], size[0], size[1])
+        # Resources also keep a spacing disk clear so new ones don't spawn right next to them
+        cells = self.spawn_service.get_reserved_cells(cells, spaced=entity.has_components(['ResourceComponent']))
+        self.reserved_cells[entity] = cells
+        self.spawn_service.reserve(cells)
+
+    def on_entity_removed(self, entity):
+        if entity.has_components(['TileComponent', 'PositionComponent']):
+            self.spawn_service.set_active(self.get_tile_cell(entity), False)
+            return
+        cells = self.reserved_cells.pop(entity, None)
+        if cells is not None:
+            self.spawn_service.release(cells)
+
+    def on_entity_unloaded(self, entity, record_id: int):
+        # Nothing spawns onto a streamed-out resource; its record keeps the cells until it is restored
+        cells = self.reserved_cells.pop(entity, None)
+        if cells is not None:
+            self.reserved_cells[record_id] = cells
+
+    def on_entity_restored(self, entity, record_id: int):
+        self.on_entity_removed(record_id)
+        self.on_entity_added(entity)
         
     def update(self, dt):
-        self.time_since_last_spawn += dt
-        print(f"Time since last spawn: {self.time_since_last_spawn}")
-        if self.time_since_last_spawn >= self.spawn_interval:
-            self.spawn_resources()
-            self.time_since_last_spawn = 0.0
+        self.spawn_resources()
+
+    def get_tile_cell(self, tile) -> tuple[int, int]:
+        x, y = self.get_position(tile)
+        return (int(x // self.spawn_service.tile_size), int(y // self.spawn_service.tile_size))
             
     def spawn_resources(self):
         resource_types = self.state.max_resource_data.keys()
@@ -26,9 +76,12 @@ class RandomResourceGenerationSystem(System):
             current_amount = self.state.resource_data.get(resource_type, 0)
             max_amount = self.state.max_resource_data.get(resource_type, 0)
             if current_amount < max_amount:
-                new_entity = self.resource_factory.create_resource(resource_type)
+                cell = self.spawn_service.sample_for_resource(resource_type)
+                if cell is None:
+                    continue  # Every loaded cell is taken; streaming in more of the map frees some
+                new_entity = self.resource_factory.create_resource(resource_type, self.spawn_service.cell_to_world(cell))
                 print(f"Spawned new resource: {resource_type}")
                 if new_entity:
-                    self.state.entities.append(new_entity)
+                    self.state.add_entity(new_entity)
+        
         
-        
\ No newline at end of file
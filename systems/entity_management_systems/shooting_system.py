@@ -7,13 +7,15 @@ class ShootingSystem(System):
     def __init__(self, state: GameState):
         super().__init__(state)
         self.required_components: list[str] = ['ControllableComponent', 'PositionComponent', 'SpriteComponent']
+        self.reads = ['ControllableComponent', 'PositionComponent', 'SpriteComponent']
+        self.writes = ['DamageComponent']  # spawns bullets
         self.is_mouse_down = False
         self.lastframe = 0.0
         self.currentframe = 0.0
         self.state = state
         
     def update(self, dt):
-        self.is_mouse_down = pg.mouse.get_pressed()[0]
+        self.is_mouse_down = self.get_mouse_buttons()[0]
         for entity in self.state.entities:
             if entity.has_components(self.required_components):
                 if  self.is_mouse_down:
@@ -28,7 +30,7 @@ class ShootingSystem(System):
         self.lastframe = self.currentframe
         # Placeholder for shooting logic
         position = self.get_position(entity)
-        mouse_x, mouse_y = pg.mouse.get_pos()
+        mouse_x, mouse_y = self.get_mouse_position()
         direction_x = mouse_x - position[0]
         direction_y = mouse_y - position[1]
         direction_length = self.pythagorus(direction_x, direction_y)
@@ -53,7 +55,7 @@ class ShootingSystem(System):
         bullet.add_component(SizeComponent(width=10, height=5))
         bullet.add_component(VelocityComponent(vx=bullet_velocity_x, vy=bullet_velocity_y))
         bullet.add_component(CollisionComponent(plane=0))
-        self.state.entities.append(bullet)
+        self.state.add_entity(bullet)
 
     def pythagorus(self, a: float, b: float) -> float:
         return (a ** 2 + b ** 2) ** 0.5
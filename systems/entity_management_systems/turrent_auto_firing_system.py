@@ -7,6 +7,8 @@ class TurretAutoFiringSystem(System):
     def __init__(self, state: GameState):
         super().__init__(state)
         self.required_components: list[str] = ['TowerComponent', 'PositionComponent']
+        self.reads = ['TowerComponent', 'PositionComponent', 'SizeComponent', 'SpatialIndex']
+        self.writes = ['DamageComponent']  # spawns bullets
         
         # Turret type configurations
         self.turret_configs = {
@@ -80,6 +82,11 @@ class TurretAutoFiringSystem(System):
         turret_size = self.get_size(turret_entity)
         turret_center_x = turret_pos[0] + turret_size[0] / 2
         turret_center_y = turret_pos[1] + turret_size[1] / 2
+
+        enemy_index = self.state.spatial_indexes.get("enemies")
+        if enemy_index is not None:
+            nearest = enemy_index.nearest(turret_center_x, turret_center_y, max_distance=max_range)
+            return nearest[0] if nearest else None
         
         nearest_enemy = None
         nearest_distance = float('inf')
@@ -161,7 +168,7 @@ class TurretAutoFiringSystem(System):
         bullet.add_component(CollisionComponent(plane=0))
         
         # Add to entities
-        self.state.entities.append(bullet)
+        self.state.add_entity(bullet)
     
     def render(self, screen):
         """Render turret range indicators (optional debug visualization)"""
@@ -1,20 +1,71 @@
 from networkx import has_bridges
 from torch import ne
 from zmq import has
-from ecs import System, Entity, Component
+from typing import cast
+from ecs import System, Entity, Component, PathComponent
 from game_state import GameState
+from economy.job_board import JobBoard
 import random
 
 class WorkerManagementSystem(System):
     def __init__(self, state: GameState):
         super().__init__(state)
         self.required_components: list[str] = ['WorkerComponent', 'HealthComponent', 'PositionComponent']
+        self.reads = ['WorkerComponent', 'HealthComponent', 'PositionComponent', 'SizeComponent', 'ResourceComponent', 'CollisionEvents']
+        self.writes = ['WorkerComponent', 'ResourceComponent', 'PositionComponent', 'VelocityComponent', 'HealthComponent', 'ResourceData', 'PathComponent']
         self.worker_chopping_radius = 50
         self.hold_resources = { }
-    def update(self, dt):
+        self.time_slices = 2  # Half of the workers claim jobs and plan routes on each update; all of them move
+        self.thinking_workers: set = set()  # this update's slice
+        self.random = random.Random(state.random_seed)
+        # Workers reserve resources through the board; assignments only change when jobs appear or go away
+        self.job_board = JobBoard()
+        self.idle_workers: dict = {}  # worker entity -> None, insertion ordered
+        self.assignments_dirty = False
         for entity in self.state.entities:
-            if entity.has_components(self.required_components):
-                self.manage_worker(entity, dt)
+            self.on_entity_added(entity)
+
+    def is_worker(self, entity) -> bool:
+        return entity.has_components(self.required_components)
+
+    def on_entity_added(self, entity):
+        if entity.has_components(['ResourceComponent', 'PositionComponent']):
+            self.job_board.post(entity, self.get_center(entity))
+            self.assignments_dirty = True
+        elif self.is_worker(entity):
+            self.idle_workers[entity] = None
+            self.assignments_dirty = True
+
+    def on_entity_removed(self, entity):
+        if entity in self.job_board.jobs:
+            # Job finished or resource gone: its worker goes back to looking for work
+            worker = self.job_board.cancel(entity)
+            if worker is not None and worker in self.state.entities:
+                self.idle_workers[worker] = None
+                self.assignments_dirty = True
+        elif self.is_worker(entity):
+            self.idle_workers.pop(entity, None)
+            if self.job_board.get_claim(entity) is not None:
+                self.job_board.release(entity)
+                self.assignments_dirty = True
+
+    def assign_jobs(self):
+        for worker in list(self.idle_workers):
+            if not self.job_board.open_jobs:
+                break
+            if worker in self.thinking_workers and self.job_board.claim_nearest(worker, self.get_center(worker)) is not None:
+                del self.idle_workers[worker]
+        # Idle workers outside this slice get their turn on the next update
+        self.assignments_dirty = bool(self.idle_workers and self.job_board.open_jobs)
+
+    def update(self, dt):
+        workers = [entity for entity in self.state.entities if entity.has_components(self.required_components)]
+        # Only decisions are sliced: moving every worker every step keeps their interpolated motion smooth
+        self.thinking_workers = set(self.get_time_slice(workers))
+        if self.assignments_dirty:
+            self.assign_jobs()
+        for entity in workers:
+            self.manage_worker(entity, dt)
 
     def manage_worker(self, entity, dt):
         worker_type = self.get_worker_type(entity)
@@ -28,24 +79,24 @@ class WorkerManagementSystem(System):
             pass
 
         if health <= 0:
-            self.state.entities.remove(entity)
+            self.state.remove_entity(entity)
             print(f"Worker of type {worker_type} has been removed from the game.")
             
     def random_movement(self, entity, position, dt):
-        random_x1 = random.uniform(-100, 100)
-        random_y1 = random.uniform(-1, 1)
-        random_x2 = random.uniform(-10, 10)
-        random_y2 = random.uniform(-10, 10)
+        random_x1 = self.random.uniform(-100, 100)
+        random_y1 = self.random.uniform(-1, 1)
+        random_x2 = self.random.uniform(-10, 10)
+        random_y2 = self.random.uniform(-10, 10)
 
         new_x = position[0] + random_x1 * dt * 5 + random_x2 * dt * 0.1
         new_y = position[1] + random_y1 * dt * 5 + random_y2 * dt * 0.1
         self.set_position(entity, (new_x, new_y))
 
     def random_movement_towards_the_player_if_present(self, entity, position, dt):
-        random_x1 = random.uniform(-1, 1)
-        random_y1 = random.uniform(-1, 1)
-        random_x2 = random.uniform(-10, 10)
-        random_y2 = random.uniform(-10, 10)
+        random_x1 = self.random.uniform(-1, 1)
+        random_y1 = self.random.uniform(-1, 1)
+        random_x2 = self.random.uniform(-10, 10)
+        random_y2 = self.random.uniform(-10, 10)
 
         if Entity.EntityRegistry.get("Player"):
             player_entity = Entity.EntityRegistry["Player"]
@@ -70,21 +121,9 @@ class WorkerManagementSystem(System):
         return self.get_position(entity)
     
     def move_towards_resource_and_mine_resource(self, entity, position, dt):
-        resource_entity = self.find_nearest_resource(entity, position, dt)
+        resource_entity = self.job_board.get_claim(entity)
         self.move_towards_resource(entity, resource_entity, dt)
 
-    def find_nearest_resource(self, entity, position, dt):
-        resources = [e for e in self.state.entities if e.has_components(['ResourceComponent', 'PositionComponent'])]
-        nearest_resource = None
-        min_distance = float('inf')
-        for resource in resources:
-            resource_position = self.get_position(resource)
-            distance = ((resource_position[0] - position[0]) ** 2 + (resource_position[1] - position[1]) ** 2) ** 0.5
-            if distance < min_distance:
-                min_distance = distance
-                nearest_resource = resource
-        return nearest_resource
-
     def move_towards_resource(self, entity, resource_entity, dt):
         if resource_entity is None:
             self.random_movement_towards_the_player_if_present(entity, self.get_position(entity), dt)
@@ -101,7 +140,18 @@ class WorkerManagementSystem(System):
         
         distance_to_tree = length
         speed = 50  # Units per second
-        if distance_to_tree > self.worker_chopping_radius:
+        has_arrived = distance_to_tree <= self.worker_chopping_radius or self.is_touching(entity, resource_entity)
+        if not has_arrived:
+            # Follow the A* route around trees, turrets and water instead of walking straight through
+            waypoint = self.get_next_waypoint(entity, resource_entity)
+            if waypoint is not None:
+                center = self.get_center(entity)
+                direction_x = waypoint[0] - center[0]
+                direction_y = waypoint[1] - center[1]
+                waypoint_distance = (direction_x ** 2 + direction_y ** 2) ** 0.5
+                if waypoint_distance != 0:
+                    direction_x /= waypoint_distance
+                    direction_y /= waypoint_distance
             # Set velocity for sprite direction detection
             velocity_x = direction_x * speed
             velocity_y = direction_y * speed
@@ -116,6 +166,41 @@ class WorkerManagementSystem(System):
             self.mine_resource(entity, resource_entity, dt)
         return self.get_position(entity)
 
+    def get_next_waypoint(self, entity, resource_entity) -> tuple[float, float] | None:
+        """World position of the next cell on the worker's path to the resource, or None to walk straight"""
+        grid = self.state.navigation_grid
+        path_finder = self.state.path_finder
+        if grid is None or path_finder is None or not entity.has_components(['SizeComponent']):
+            return None
+        if not entity.has_components(['PathComponent']):
+            entity.add_component(PathComponent())
+        path_component = cast(PathComponent, entity.get_component("PathComponent"))
+
+        current_cell = grid.world_to_cell(*self.get_center(entity))
+        goal_cell = grid.world_to_cell(*self.get_center(resource_entity))
+        path = path_component.path
+        next_cell_blocked = (path_component.path_index < len(path)
+                             and path[path_component.path_index] != goal_cell
+                             and not grid.is_walkable(*path[path_component.path_index]))
+        # Only search again when the target changed, the route ran out or something now blocks it,
+        # and only on the worker's own slice; until then it keeps to the route it has
+        needs_path = path_component.goal_cell != goal_cell or path_component.path_index >= len(path) or next_cell_blocked
+        if needs_path and entity not in self.thinking_workers:
+            if path_component.goal_cell != goal_cell or not path:
+                return None
+            return grid.cell_to_world(*path[min(path_component.path_index, len(path) - 1)])
+        if needs_path:
+            path = path_finder.find_path(current_cell, goal_cell) or []
+            path_component.path = path
+            path_component.path_index = 0
+            path_component.goal_cell = goal_cell
+            if not path:
+                return None
+
+        while path_component.path_index < len(path) - 1 and path[path_component.path_index] == current_cell:
+            path_component.path_index += 1
+        return grid.cell_to_world(*path[path_component.path_index])
+
     def mine_resource(self, entity, resource_entity, dt):
         resource_health = self.get_health(resource_entity)
         damage_per_mine = 30  # Damage per mine
@@ -126,7 +211,7 @@ class WorkerManagementSystem(System):
 
         self.set_health(resource_entity, resource_health)
         if resource_health <= 0:
-            self.state.entities.remove(resource_entity)
+            self.state.remove_entity(resource_entity)
             entity.state_data[resource_type] = entity.state_data.get(resource_type, 0) + 100
             print(f"Resource {resource_type} has been depleted and removed from the game.")
         
\ No newline at end of file
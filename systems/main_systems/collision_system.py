@@ -2,18 +2,166 @@ from operator import is_
 
 from regex import E, P
 from traitlets import Bool
+from typing import cast
 from ecs import System, Entity, Component, PositionComponent, SizeComponent, CollisionComponent, HealthComponent, DamageComponent
 import pygame as pg
 
+class CollisionEvent:
+    ENTER = "enter"
+    STAY = "stay"
+    EXIT = "exit"
+
+    def __init__(self, phase: str, entity: Entity, other_entity: Entity):
+        self.phase = phase
+        self.entity = entity
+        self.other_entity = other_entity
+
+    def involves(self, entity) -> bool:
+        return entity is self.entity or entity is self.other_entity
+
+    def get_other(self, entity) -> Entity:
+        return self.other_entity if entity is self.entity else self.entity
+
 class CollisionSystem(System):
+    CELL_SIZE = 64  # Size of a spatial grid cell in pixels
+
     def __init__(self, state):
         super().__init__(state)
         self.required_components: list[str] = ['CollisionComponent', 'PositionComponent', 'SizeComponent']
+        self.reads = ['CollisionComponent', 'PositionComponent', 'SizeComponent', 'VelocityComponent', 'DamageComponent']
+        self.writes = ['CollisionComponent', 'HealthComponent', 'DamageComponent', 'StateData', 'CollisionEvents']
+        # Static colliders never move, so their rects and grid cells are only touched on spawn/despawn
+        self.static_grid: dict[tuple[int, int], list[Entity]] = {}
+        self.static_rects: dict[Entity, pg.Rect] = {}
+        # Dynamic colliders are re-read every frame (dict used as an ordered set)
+        self.dynamic_colliders: dict[Entity, None] = {}
+        # Contact pairs from the previous frame, diffed against the current ones to classify events
+        self.active_pairs: dict[tuple[Entity, Entity], None] = {}
+        state.collision_events = []
+        state.collision_contacts = {}
+        for entity in self.state.entities:
+            self.on_entity_added(entity)
+
+    def on_entity_added(self, entity):
+        if not entity.has_components(self.required_components):
+            return
+        if self.get_collision_is_static(entity):
+            self.add_static_collider(entity)
+        else:
+            self.dynamic_colliders[entity] = None
+
+    def on_entity_removed(self, entity):
+        self.dynamic_colliders.pop(entity, None)
+        if entity in self.static_rects:
+            self.remove_static_collider(entity)
+
+    def add_static_collider(self, entity):
+        rect = self.get_rect(entity)
+        self.static_rects[entity] = rect
+        for cell in self.get_cells(rect):
+            self.static_grid.setdefault(cell, []).append(entity)
+
+    def remove_static_collider(self, entity):
+        rect = self.static_rects.pop(entity)
+        for cell in self.get_cells(rect):
+            cell_entities = self.static_grid.get(cell)
+            if cell_entities and entity in cell_entities:
+                cell_entities.remove(entity)
+                if not cell_entities:
+                    del self.static_grid[cell]
+
+    def get_cells(self, rect: pg.Rect) -> list[tuple[int, int]]:
+        left = rect.left // self.CELL_SIZE
+        top = rect.top // self.CELL_SIZE
+        right = max(rect.left, rect.right - 1) // self.CELL_SIZE
+        bottom = max(rect.top, rect.bottom - 1) // self.CELL_SIZE
+        return [(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)]
+
+    def is_tracked(self, entity) -> bool:
+        return entity in self.dynamic_colliders or entity in self.static_rects
+        
+    def get_pair(self, entity, other_entity) -> tuple[Entity, Entity]:
+        if id(entity) < id(other_entity):
+            return (entity, other_entity)
+        return (other_entity, entity)
         
     def update(self, dt):
-        for entity in self.state.entities:
-            if entity.has_components(self.required_components):
-                self.handle_collision(entity, dt)
+        # dicts rather than sets so events come out in a stable, detection order
+        current_pairs = dict.fromkeys(self.find_contacts())
+        events: list[CollisionEvent] = []
+        for pair in current_pairs:
+            phase = CollisionEvent.STAY if pair in self.active_pairs else CollisionEvent.ENTER
+            events.append(CollisionEvent(phase, pair[0], pair[1]))
+        for pair in self.active_pairs:
+            if pair in current_pairs:
+                continue
+            events.append(CollisionEvent(CollisionEvent.EXIT, pair[0], pair[1]))
+
+        self.update_contacts(current_pairs)
+        self.active_pairs = current_pairs
+        self.state.collision_events = events
+        self.resolve_collisions(events)
+
+    def update_contacts(self, current_pairs: dict[tuple[Entity, Entity], None]):
+        """Rebuild the per-entity contact lists and keep CollisionComponent.is_colliding in sync"""
+        contacts: dict[Entity, list[Entity]] = {}
+        for entity, other_entity in current_pairs:
+            contacts.setdefault(entity, []).append(other_entity)
+            contacts.setdefault(other_entity, []).append(entity)
+
+        for entity in self.state.collision_contacts:
+            if entity not in contacts and entity.has_components(['CollisionComponent']):
+                cast(CollisionComponent, entity.get_component("CollisionComponent")).is_colliding = False
+        for entity in contacts:
+            cast(CollisionComponent, entity.get_component("CollisionComponent")).is_colliding = True
+        self.state.collision_contacts = contacts
+
+    def resolve_collisions(self, events: list[CollisionEvent]):
+        for event in events:
+            if event.phase != CollisionEvent.ENTER:
+                continue
+            # An earlier response may already have removed one of the pair (e.g. a spent bullet)
+            if self.is_tracked(event.entity) and self.is_tracked(event.other_entity):
+                self.resolve_collision(event.entity, event.other_entity)
+
+    def find_contacts(self) -> list[tuple[Entity, Entity]]:
+        """Query every dynamic collider against the static grid and the other dynamic colliders"""
+        dynamic_rects: dict[Entity, pg.Rect] = {}
+        dynamic_grid: dict[tuple[int, int], list[Entity]] = {}
+        for entity in self.dynamic_colliders:
+            rect = self.get_rect(entity)
+            dynamic_rects[entity] = rect
+            for cell in self.get_cells(rect):
+                dynamic_grid.setdefault(cell, []).append(entity)
+
+        contacts = []
+        checked_dynamic_pairs: set[tuple[Entity, Entity]] = set()
+        for entity, rect in dynamic_rects.items():
+            collision_plane = self.get_collition_plane(entity)
+            checked_static: set[Entity] = set()
+            for cell in self.get_cells(rect):
+                for other_entity in self.static_grid.get(cell, ()):
+                    if other_entity in checked_static:
+                        continue
+                    checked_static.add(other_entity)
+                    # Only check collision if on the same plane
+                    if collision_plane != self.get_collition_plane(other_entity):
+                        continue
+                    if rect.colliderect(self.static_rects[other_entity]):
+                        contacts.append(self.get_pair(entity, other_entity))
+
+                for other_entity in dynamic_grid.get(cell, ()):
+                    if other_entity is entity:  # Skip self-collision
+                        continue
+                    pair = self.get_pair(entity, other_entity)
+                    if pair in checked_dynamic_pairs:
+                        continue
+                    checked_dynamic_pairs.add(pair)
+                    if collision_plane != self.get_collition_plane(other_entity):
+                        continue
+                    if rect.colliderect(dynamic_rects[other_entity]):
+                        contacts.append(pair)
+        return contacts
 
     def check4(self, entity, other_entity , entityname : list[str] | str, otherentityname : list[str] | str):
         if isinstance(entityname, str):
@@ -25,30 +173,6 @@ class CollisionSystem(System):
         if any(entity.name.startswith(name) for name in otherentityname) and any(other_entity.name.startswith(name) for name in entityname):
             return True
         return False
-                
-    def handle_collision(self, entity, dt):
-        collision_plane = self.get_collition_plane(entity)
-        position = self.get_position(entity)
-        size = self.get_size(entity)
-        rect = pg.Rect(position[0], position[1], size[0], size[1])
-        
-        for other_entity in self.state.entities:
-            if other_entity == entity:  # Skip self-collision
-                continue
-                
-            if other_entity.has_components(self.required_components):
-                other_collision_plane = self.get_collition_plane(other_entity)
-                
-                # Only check collision if on the same plane
-                if collision_plane != other_collision_plane:
-                    continue
-                    
-                other_position = self.get_position(other_entity)
-                other_size = self.get_size(other_entity)
-                other_rect = pg.Rect(other_position[0], other_position[1], other_size[0], other_size[1])
-                
-                if rect.colliderect(other_rect):
-                    self.resolve_collision(entity, other_entity)
                         
     def resolve_collision(self, entity, other_entity):
         entity_name = entity.name
@@ -80,5 +204,5 @@ class CollisionSystem(System):
         
         # Remove bullet from the game
         if bullet in self.state.entities:
-            self.state.entities.remove(bullet)
+            self.state.remove_entity(bullet)
             self.state.state_data["coins"] += 1
@@ -25,6 +25,8 @@ class InputSystem(System):
         super().__init__(state)
         self.state = state
         self.required_components = ['ControllableComponent', 'VelocityComponent']
+        self.reads = []
+        self.writes = []
         self.pressed_keys = set()
         self.movement_speed = speed  # Movement speed in pixels per second
         
@@ -1,51 +1,254 @@
 import random
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
 from ecs import Entity, PositionComponent, SizeComponent, SpriteComponent, System, TileComponent, TooltipComponent
+from factory.resource_factory import ResourceFactory
 import sprite_manager
+import numpy as np
 import os
+from world.map_format import ChunkedMap, MapFormatError, convert_text_map, read_map_seed
+from world.terrain_generator import TerrainGenerator
+from map import OBJECT_LAYER, OBJECT_TREE, OBJECT_STONE, TILE_STONE, TILE_WATER
+
+MAP_TEXT_PATH = "assets/maps/map.txt"
+MAP_BINARY_PATH = "assets/maps/map.bin"
+DEFAULT_MAP_SIZE = 100  # tiles per side of a generated map
+# An unloaded chunk keeps its resources as packed (resource type, x, y, health, record id) records
+RESOURCE_RECORD = struct.Struct("<16sfffI")
+OBJECT_RESOURCES = {OBJECT_TREE: "wood", OBJECT_STONE: "stone"}  # resource each generated map object becomes
 
 class MapLoadingSystem(System):
     def __init__(self, state):
         self.state = state
         self.position = 0, 0
         super().__init__(state)
+        self.random = random.Random(state.random_seed)
+        self.tile_variant_seed = self.random.getrandbits(32)  # Tiles pick the same sprite every time they are loaded
+        self.map_seed = self.random.getrandbits(32)  # Generator seed; a generated map from another seed is replaced
+        self.map_data = np.zeros((DEFAULT_MAP_SIZE, DEFAULT_MAP_SIZE), dtype=np.uint8)  # Used if the map file can't be read
+        self.map_file: ChunkedMap | None = None
         self.load_map()
-        self.required_components: list[str] = ['TileComponent', 'PositionComponent', 'SizeComponent', 'SpriteComponent']    
-        self.map_data = [[0 for _ in range(100)] for _ in range(100)]  # Placeholder for map data
+        self.required_components: list[str] = ['TileComponent', 'PositionComponent', 'SizeComponent', 'SpriteComponent']
+        self.reads = ['PositionComponent', 'ControllableComponent', 'WorkerComponent', 'EnemyComponent', 'Camera']
+        self.writes = ['TileComponent', 'ResourceComponent', 'HealthComponent']
+        self.tile_size = 32
         self.sprite_manager = sprite_manager.SpriteManager()
-        for i, map_slice in enumerate(self.map_data):
-            for j, tile_value in enumerate(map_slice):
-                index = tile_value + (i * len(map_slice)) + j
+        self.resource_factory = ResourceFactory(seed=state.random_seed)
+
+        # Chunk streaming: only chunks near the camera or an active agent exist as entities
+        self.chunk_size = self.map_file.chunk_size if self.map_file is not None else 32
+        self.chunks_x = -(-len(self.map_data[0]) // self.chunk_size) if len(self.map_data) else 0
+        self.chunks_y = -(-len(self.map_data) // self.chunk_size)
+        self.load_radius = 1  # chunks around each point of interest that are kept loaded
+        self.evict_radius = 2  # loaded chunks are only dropped past this, so walking along a border doesn't thrash
+        self.max_chunk_loads = 2  # chunks turned into entities per update, bounding the cost of a stream burst
+        self.update_interval = 0.25  # seconds between streaming passes
+        self.loaded_chunks: dict[tuple[int, int], list[Entity]] = {}  # chunk -> its tile entities
+        self.pending_chunks: dict[tuple[int, int], Future] = {}  # chunk -> tile data being read in the background
+        self.chunk_resources: dict[tuple[int, int], dict[Entity, None]] = {}
+        self.evicted_chunks: dict[tuple[int, int], bytes] = {}  # chunk -> serialized resources
+        self.visited_chunks: set[tuple[int, int]] = set()  # generated objects are only placed on the first load
+        self.next_record_id = 0  # systems keep a serialized resource's cells reserved under its record id
+        self.loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-loader")
+        for chunk in self.get_wanted_chunks(self.load_radius):
+            self.request_chunk(chunk)
+        self.instantiate_pending_chunks(len(self.pending_chunks))
+
+    def get_chunk_for_position(self, x: float, y: float) -> tuple[int, int]:
+        chunk_pixels = self.chunk_size * self.tile_size
+        return (int(x // chunk_pixels), int(y // chunk_pixels))
+
+    def get_points_of_interest(self) -> list[tuple[float, float, float, float]]:
+        """World rects that need the map around them: the camera view and every agent that walks around"""
+        rects = []
+        camera = self.state.camera
+        if camera is not None:
+            rects.append((camera.left, camera.top, camera.right, camera.bottom))
+        for entity in self.state.entities:
+            if entity.has_components(['PositionComponent', 'VelocityComponent']) and (
+                    entity.has_components(['WorkerComponent']) or entity.has_components(['EnemyComponent'])
+                    or entity.has_components(['ControllableComponent'])):
+                x, y = self.get_position(entity)
+                rects.append((x, y, x, y))
+        return rects
+
+    def get_wanted_chunks(self, radius: int) -> dict[tuple[int, int], None]:
+        wanted: dict[tuple[int, int], None] = {}
+        for left, top, right, bottom in self.get_points_of_interest():
+            first_x, first_y = self.get_chunk_for_position(left, top)
+            last_x, last_y = self.get_chunk_for_position(right, bottom)
+            for chunk_y in range(max(0, first_y - radius), min(self.chunks_y - 1, last_y + radius) + 1):
+                for chunk_x in range(max(0, first_x - radius), min(self.chunks_x - 1, last_x + radius) + 1):
+                    wanted[(chunk_x, chunk_y)] = None
+        return wanted
+
+    def read_chunk_tiles(self, chunk: tuple[int, int], with_objects: bool) -> tuple[np.ndarray, np.ndarray | None]:
+        """Runs on the loader thread: copying the memory-mapped chunk pages it in off the main thread"""
+        chunk_x, chunk_y = chunk
+        if self.map_file is not None:
+            tiles = np.array(self.map_file.get_chunk(chunk_x, chunk_y))
+            has_objects = with_objects and self.map_file.layer_count > OBJECT_LAYER
+            objects = np.array(self.map_file.get_chunk(chunk_x, chunk_y, OBJECT_LAYER)) if has_objects else None
+            return tiles, objects
+        size = self.chunk_size
+        return np.array(self.map_data[chunk_y * size:(chunk_y + 1) * size, chunk_x * size:(chunk_x + 1) * size]), None
+
+    def request_chunk(self, chunk: tuple[int, int]):
+        if chunk not in self.loaded_chunks and chunk not in self.pending_chunks:
+            first_visit = chunk not in self.visited_chunks
+            self.pending_chunks[chunk] = self.loader.submit(self.read_chunk_tiles, chunk, first_visit)
+
+    def instantiate_pending_chunks(self, budget: int):
+        # Oldest requests first and always waiting for them, so the world comes out the same on every run
+        for chunk in list(self.pending_chunks)[:budget]:
+            tiles, objects = self.pending_chunks.pop(chunk).result()
+            self.instantiate_chunk(chunk, tiles, objects)
+
+    def instantiate_chunk(self, chunk: tuple[int, int], tiles: np.ndarray, objects: np.ndarray | None = None):
+        chunk_x, chunk_y = chunk
+        map_width = len(self.map_data[0])
+        map_height = len(self.map_data)
+        grass_sprite = self.sprite_manager.get_sprite("GRASS")
+        dirt_sprite = self.sprite_manager.get_sprite(f"dirt")
+        land_sprites = [grass_sprite, dirt_sprite]
+        # Water and stone must look like what they are, since they block paths and spawns; land varies by hash
+        tile_sprites = {TILE_WATER: self.sprite_manager.get_sprite("water"), TILE_STONE: self.sprite_manager.get_sprite("stone")}
+        tile_entities = []
+        for local_y, map_slice in enumerate(tiles):
+            tile_y = chunk_y * self.chunk_size + local_y
+            if tile_y >= map_height:
+                break
+            for local_x, tile_value in enumerate(map_slice):
+                tile_x = chunk_x * self.chunk_size + local_x
+                if tile_x >= map_width:
+                    break
+                index = (tile_y * map_width) + tile_x
                 tile = Entity(f"Tile_{index}")
-                HTileCount = 25  # Placeholder for horizontal tile count
-                tile_x = index % HTileCount
-                tile_y = index // HTileCount
-                grass_sprite = self.sprite_manager.get_sprite(f"grass")
-                dirt_sprite = self.sprite_manager.get_sprite(f"dirt")
-                land_sprites = [grass_sprite, dirt_sprite]
-                random_land_sprite = random.choice(land_sprites)
-                tile.add_component(PositionComponent(x=tile_x * 32, y=tile_y * 32))
-                tile.add_component(SpriteComponent(sprite=random_land_sprite))
-                tile.add_component(TileComponent(tile_type=tile_value))
-                tile.add_component(SizeComponent(width=32, height=32))
-                self.state.entities.append(tile)
-                
+                tile_sprite = tile_sprites.get(int(tile_value))
+                if tile_sprite is None:
+                    tile_sprite = land_sprites[(index * 2654435761 ^ self.tile_variant_seed) >> 7 & 1]
+                tile.add_component(PositionComponent(x=tile_x * self.tile_size, y=tile_y * self.tile_size))
+                tile.add_component(SpriteComponent(sprite=tile_sprite))
+                tile.add_component(TileComponent(tile_type=int(tile_value)))
+                tile.add_component(SizeComponent(width=self.tile_size, height=self.tile_size))
+                self.state.add_entity(tile)
+                tile_entities.append(tile)
+        self.loaded_chunks[chunk] = tile_entities
+        if chunk not in self.visited_chunks:
+            self.visited_chunks.add(chunk)
+            if objects is not None:
+                self.place_objects(chunk, objects)
+        self.restore_resources(chunk)
+
+    def place_objects(self, chunk: tuple[int, int], objects: np.ndarray):
+        """Turn the trees and stones the generator placed in this chunk into resources"""
+        chunk_x, chunk_y = chunk
+        map_width = len(self.map_data[0])
+        map_height = len(self.map_data)
+        for local_y, local_x in zip(*np.nonzero(objects)):
+            tile_x = chunk_x * self.chunk_size + int(local_x)
+            tile_y = chunk_y * self.chunk_size + int(local_y)
+            resource_type = OBJECT_RESOURCES.get(int(objects[local_y, local_x]))
+            if resource_type is None or tile_x >= map_width or tile_y >= map_height:
+                continue
+            resource = self.resource_factory.create_resource(resource_type, (tile_x * self.tile_size, tile_y * self.tile_size))
+            if resource is not None:
+                self.state.add_entity(resource)
+
+    def evict_chunk(self, chunk: tuple[int, int]):
+        for tile in self.loaded_chunks.pop(chunk, []):
+            self.state.remove_entity(tile)
+            Entity.EntityRegistry.pop(tile.name, None)
+        self.serialize_resources(chunk)
+
+    def serialize_resources(self, chunk: tuple[int, int]):
+        resources = self.chunk_resources.pop(chunk, None)
+        if not resources:
+            return
+        records = [self.evicted_chunks.get(chunk, b"")]
+        for resource in list(resources):
+            x, y = self.get_position(resource)
+            resource_type = self.get_resource_type(resource).encode()[:16]
+            records.append(RESOURCE_RECORD.pack(resource_type, x, y, self.get_health(resource), self.next_record_id))
+            self.state.unload_entity(resource, self.next_record_id)
+            self.next_record_id += 1
+            Entity.EntityRegistry.pop(resource.name, None)
+        self.evicted_chunks[chunk] = b"".join(records)
+
+    def restore_resources(self, chunk: tuple[int, int]):
+        records = self.evicted_chunks.pop(chunk, None)
+        if not records:
+            return
+        for resource_type, x, y, health, record_id in RESOURCE_RECORD.iter_unpack(records):
+            resource = self.resource_factory.create_resource(resource_type.rstrip(b"\0").decode(), (x, y))
+            if resource is not None:
+                self.set_health(resource, health)
+                self.state.restore_entity(resource, record_id)
+
+    def on_entity_added(self, entity):
+        if entity.has_components(['ResourceComponent', 'PositionComponent']):
+            chunk = self.get_chunk_for_position(*self.get_position(entity))
+            self.chunk_resources.setdefault(chunk, {})[entity] = None
+
+    def on_entity_removed(self, entity):
+        if entity.has_components(['ResourceComponent', 'PositionComponent']):
+            chunk = self.get_chunk_for_position(*self.get_position(entity))
+            resources = self.chunk_resources.get(chunk)
+            if resources is not None:
+                resources.pop(entity, None)
+                if not resources:
+                    del self.chunk_resources[chunk]
+
+    def update(self, dt):
+        wanted = self.get_wanted_chunks(self.load_radius)
+        keep = self.get_wanted_chunks(self.evict_radius)
+        for chunk in list(self.loaded_chunks):
+            if chunk not in keep:
+                self.evict_chunk(chunk)
+        for chunk in list(self.pending_chunks):
+            if chunk not in keep:
+                self.pending_chunks.pop(chunk).cancel()
+        # Resources spawned into chunks nobody is near go straight to their chunk's serialized form
+        for chunk in list(self.chunk_resources):
+            if chunk not in self.loaded_chunks and chunk not in self.pending_chunks:
+                self.serialize_resources(chunk)
+        for chunk in wanted:
+            self.request_chunk(chunk)
+        self.instantiate_pending_chunks(self.max_chunk_loads)
+
+    def shutdown(self):
+        self.loader.shutdown(wait=False, cancel_futures=True)
+
+    def needs_generated_map(self) -> bool:
+        """No map yet, or one generated from another seed than this run's (unseeded runs keep any map)"""
+        if not os.path.exists(MAP_BINARY_PATH):
+            return True
+        if self.state.random_seed is None:
+            return False
+        try:
+            return read_map_seed(MAP_BINARY_PATH) != self.map_seed
+        except (OSError, MapFormatError):
+            return True
+
     def load_map(self): 
-    #Check for save map file exists?
+        # The binary map is memory-mapped; a text map is converted to it once (and again whenever it is edited)
         try:
-            with open("assets/maps/map.txt", "r") as f:
-                lines = f.readlines()
-                self.map_data = [list(map(int, line.strip().split(','))) for line in lines]    
+            map_path = self.state.map_path  # a map prepared elsewhere (e.g. by the benchmarks) is used as is
+            if map_path is None:
+                map_path = MAP_BINARY_PATH
+                text_is_newer = os.path.exists(MAP_TEXT_PATH) and (
+                    not os.path.exists(MAP_BINARY_PATH) or os.path.getmtime(MAP_TEXT_PATH) > os.path.getmtime(MAP_BINARY_PATH))
+                if text_is_newer:
+                    convert_text_map(MAP_TEXT_PATH, MAP_BINARY_PATH)
+                    print("Converted text map to binary format.")
+                elif not os.path.exists(MAP_TEXT_PATH) and self.needs_generated_map():
+                    # Seeded so a fixed --seed always produces the same world
+                    os.makedirs("assets/maps", exist_ok=True)
+                    TerrainGenerator(self.map_seed).generate_file(MAP_BINARY_PATH, DEFAULT_MAP_SIZE, DEFAULT_MAP_SIZE)
+                    print("Generated a new map.")
+            self.map_file = ChunkedMap(map_path)
+            self.map_data = self.map_file.to_array(0)
+            print("Map loaded successfully.")
         except Exception as e:
-            if e.__class__ == FileNotFoundError:
-                #Write default map data to file
-                default_map_data = [[0 for _ in range(100)] for _ in range(100)]
-                # Create the directory if it doesn't exist
-                os.makedirs("assets/maps", exist_ok=True)
-                with open("assets/maps/map.txt", "w") as f:
-                    for row in default_map_data:
-                        f.write(','.join(map(str, row)) + '\n')
-                self.map_data = default_map_data    
-                print("Map loaded successfully.")
-            else:
-                print(f"Error loading map: {e}")
+            print(f"Error loading map: {e}")
           
\ No newline at end of file
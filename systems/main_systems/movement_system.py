@@ -6,6 +6,8 @@ class MovementSystem(System):
     def __init__(self, state: GameState):
         super().__init__(state)
         self.required_components = ['PositionComponent', 'VelocityComponent']
+        self.reads = ['PositionComponent', 'VelocityComponent', 'FrictionComponent']
+        self.writes = ['PositionComponent', 'VelocityComponent']
         
         # Physics constants for more realistic movement
         self.max_velocity = 500.0  # Maximum velocity in pixels/second
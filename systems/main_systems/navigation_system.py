@@ -0,0 +1,49 @@
+from ecs import System
+from game_state import GameState
+from navigation.pathfinding import NavigationGrid, PathFinder
+
+class NavigationSystem(System):
+    def __init__(self, state: GameState):
+        super().__init__(state)
+        self.required_components: list[str] = ['PositionComponent', 'SizeComponent']
+        self.blocking_components: list[str] = ['ResourceComponent', 'TowerComponent', 'FactoryComponent']
+        self.reads = []
+        self.writes = []
+        # Built from the tile grid loaded by MapLoadingSystem, which must be initialized first
+        map_loading_system = state.systems["MapLoadingSystem"]
+        self.grid = NavigationGrid(map_loading_system.map_data, map_loading_system.tile_size)
+        self.path_finder = PathFinder(self.grid)
+        state.navigation_grid = self.grid
+        state.path_finder = self.path_finder
+        self.occupied_cells: dict = {}  # entity -> cells it blocks
+        for entity in self.state.entities:
+            self.on_entity_added(entity)
+
+    def is_blocking(self, entity) -> bool:
+        return entity.has_components(self.required_components) and any(
+            entity.has_components([component]) for component in self.blocking_components)
+
+    def on_entity_added(self, entity):
+        if not self.is_blocking(entity):
+            return
+        position = self.get_position(entity)
+        size = self.get_size(entity)
+        cells = self.grid.get_cells_for_rect(position[0], position[1], size[0], size[1])
+        self.occupied_cells[entity] = cells
+        self.path_finder.invalidate_blocked(self.grid.add_occupant(cells))
+
+    def on_entity_removed(self, entity):
+        cells = self.occupied_cells.pop(entity, None)
+        if cells is None:
+            return
+        self.path_finder.invalidate_freed(self.grid.remove_occupant(cells))
+
+    def on_entity_unloaded(self, entity, record_id: int):
+        # Paths keep going around a streamed-out resource until its record is restored
+        cells = self.occupied_cells.pop(entity, None)
+        if cells is not None:
+            self.occupied_cells[record_id] = cells
+
+    def on_entity_restored(self, entity, record_id: int):
+        self.on_entity_removed(record_id)
+        self.on_entity_added(entity)
@@ -9,6 +9,8 @@ class RenderSystem(System):
     def __init__(self, state: GameState):
         super().__init__(state)
         self.rendering_components = [ 'PositionComponent', 'SpriteComponent' ]
+        self.reads = ['AnimatedSpriteComponent']
+        self.writes = ['AnimatedSpriteComponent']
         
     def update(self, dt):
         for entity in self.entities:
@@ -20,13 +22,13 @@ class RenderSystem(System):
     def render(self, screen):
         for entity in self.entities:
             if entity.has_components(self.rendering_components):
-                position = self.get_position(entity)
+                position = self.get_render_position(entity)
                 sprite = self.get_sprite(entity)
                 screen.blit(sprite, (int(position[0]), int(position[1])))
                 
             if entity.has_components(['TextComponent']):
                 text = self.get_text(entity)
-                position = self.get_position(entity)
+                position = self.get_render_position(entity)
                 font = pg.font.Font(None, 16)
                 text_surface = font.render(text, True, (255, 255, 255))
                 text_rect = text_surface.get_rect(center=(position[0] + text_surface.get_width(), position[1] + 20))
@@ -37,7 +39,7 @@ class RenderSystem(System):
                 entity.has_components(['SpriteComponent']) or entity.has_components(['AnimatedSpriteComponent'])
             ):
                 health = self.get_health(entity)
-                position = self.get_position(entity)
+                position = self.get_render_position(entity)
                 # Determine width from sprite or current animation frame
                 if entity.has_components(['SpriteComponent']):
                     base_surface = self.get_sprite(entity)
@@ -58,7 +60,7 @@ class RenderSystem(System):
                 
 
             if entity.has_components(['HealthComponent', 'PositionComponent', 'AnimatedSpriteComponent']):
-                position = self.get_position(entity)
+                position = self.get_render_position(entity)
                 current_frame_index = self.get_sprite_current_frame_index(entity)
                 time_since_last_frame = self.get_sprite_time_since_last_frame(entity)
                 sprite_duration = self.get_sprite_frame_duration(entity)
@@ -88,7 +90,7 @@ class RenderSystem(System):
                 if is_off:
                     continue
                 tooltip_text = self.get_tooltip(entity)
-                position = self.get_position(entity)
+                position = self.get_render_position(entity)
                 
                 if tooltip_text:
                     font = pg.font.SysFont('Arial', 16)
@@ -0,0 +1,54 @@
+from ecs import System
+from game_state import GameState
+from spatial_index import KDTreeIndex, GridIndex
+
+class SpatialIndexSystem(System):
+    def __init__(self, state: GameState):
+        super().__init__(state)
+        self.required_components: list[str] = ['PositionComponent', 'SizeComponent']
+        self.reads = ['PositionComponent', 'SizeComponent', 'VelocityComponent', 'EnemyComponent', 'ResourceComponent', 'TooltipComponent']
+        self.writes = ['SpatialIndex']
+        # Entity centres; stable sets go in a lazily rebuilt KD-tree, moving ones in a bucket grid
+        self.indexes = {
+            "resources": KDTreeIndex(),
+            "enemies": GridIndex(cell_size=64),
+            "tooltips": GridIndex(cell_size=64),
+        }
+        state.spatial_indexes = self.indexes
+        self.moving_entities: dict = {}  # entity -> names of the indexes it is in
+        for entity in self.state.entities:
+            self.on_entity_added(entity)
+
+    def get_index_names(self, entity) -> list[str]:
+        if not entity.has_components(self.required_components):
+            return []
+        index_names = []
+        if entity.has_components(['ResourceComponent']):
+            index_names.append("resources")
+        if entity.has_components(['EnemyComponent']):
+            index_names.append("enemies")
+        # Tiles are left out: there are thousands of them and they never show tooltips
+        if entity.has_components(['TooltipComponent']) and not entity.has_components(['TileComponent']):
+            index_names.append("tooltips")
+        return index_names
+
+    def on_entity_added(self, entity):
+        index_names = self.get_index_names(entity)
+        if not index_names:
+            return
+        center = self.get_center(entity)
+        for index_name in index_names:
+            self.indexes[index_name].insert(entity, center[0], center[1])
+        if entity.has_components(['VelocityComponent']):
+            self.moving_entities[entity] = index_names
+
+    def on_entity_removed(self, entity):
+        self.moving_entities.pop(entity, None)
+        for index in self.indexes.values():
+            index.remove(entity)
+
+    def update(self, dt):
+        for entity, index_names in self.moving_entities.items():
+            center = self.get_center(entity)
+            for index_name in index_names:
+                self.indexes[index_name].move(entity, center[0], center[1])
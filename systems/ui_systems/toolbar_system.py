@@ -6,9 +6,17 @@ class ToolbarSystem(System):
     def __init__(self, state):
         super().__init__(state)
         self.required_components: list[str] = []
+        self.reads = ['HealthComponent', 'StateData', 'ResourceData']
+        self.writes = []
         self.coins = 0
         self.wave = 1
         self.enemy_count = 0
+        self.wood = 0
+        self.stone = 0
+        self.water = 0
+        self.food = 0
+        self.player_health = 0
+        self.player_max_health = 100
         
     def update(self, dt):
         # Update toolbar data from game state
@@ -8,9 +8,17 @@ class TooltipSystem(System):
         super().__init__(state)
         self.state = state
         self.required_components: list[str] = ['TooltipComponent', 'PositionComponent', 'SizeComponent']
+        self.reads = ['TooltipComponent', 'PositionComponent', 'SizeComponent', 'SpatialIndex']
+        self.writes = ['TooltipComponent']
+        self.mouse_moved = True  # The nearest entity is only searched again after the mouse moves
+        self.nearest_entity: Entity | None = None
+
+    def handle_event(self, event):
+        if event.type == pg.MOUSEMOTION:
+            self.mouse_moved = True
         
     def get_displacement_from_mouse(self, entity: Entity) -> float:
-        mouse_pos = pg.mouse.get_pos()
+        mouse_pos = self.get_mouse_position()
         position = self.get_position(entity)
         size = self.get_size(entity)
         rect = pg.Rect(position,size)
@@ -19,6 +27,13 @@ class TooltipSystem(System):
         return distance
 
     def check_for_nearest_entity_to_mouse(self):
+        tooltip_index = self.state.spatial_indexes.get("tooltips")
+        if tooltip_index is not None:
+            mouse_pos = self.get_mouse_position()
+            nearest = tooltip_index.nearest(mouse_pos[0], mouse_pos[1])
+            self.show_tooltip(nearest[0] if nearest else None)
+            return
+
         entities_with_tooltips = [entity for entity in self.state.entities if entity.has_components(self.required_components)]
         if not entities_with_tooltips:
             return
@@ -38,6 +53,16 @@ class TooltipSystem(System):
                 self.set_tooltip_status(entity, False)
 
 
+    def show_tooltip(self, nearest_entity: Entity | None):
+        # Only the previous and the new nearest entity change state
+        if nearest_entity is self.nearest_entity:
+            return
+        if self.nearest_entity is not None and self.nearest_entity in self.state.entities:
+            self.set_tooltip_status(self.nearest_entity, False)
+        if nearest_entity is not None:
+            self.set_tooltip_status(nearest_entity, True)
+        self.nearest_entity = nearest_entity
+
     def find_minimum(self, array) -> Entity | None:
         min_value = float('inf')
         min_entity = None
@@ -50,6 +75,9 @@ class TooltipSystem(System):
         
 
     def update(self, dt):
+        if not self.mouse_moved:
+            return
+        self.mouse_moved = False
         self.check_for_nearest_entity_to_mouse()
 
     def render(self, screen: pg.Surface):
@@ -68,7 +96,7 @@ class TooltipSystem(System):
                 continue
         
             tooltip_text = self.get_tooltip(entity)
-            position = self.get_position(entity)
+            position = self.get_render_position(entity)
             
             if tooltip_text:
                 font = pg.font.SysFont('Arial', 16)
@@ -1,10 +1,14 @@
-from ecs import System, Entity, PositionComponent, SpriteComponent, SizeComponent, TowerComponent, HealthComponent
+from ecs import System, Entity
+from factory.prefabs import Prefab, PREFAB_DEFINITIONS, get_turret_definition
+from spatial_index import OccupancyGrid
 import pygame as pg
 
 class TurretPlacementSystem(System):
     def __init__(self, state):
         super().__init__(state)
         self.required_components: list[str] = []
+        self.reads = []
+        self.writes = []
         self.placement_mode = False
         self.selected_turret_type = "Basic"
         self.preview_turret = None
@@ -15,6 +19,45 @@ class TurretPlacementSystem(System):
             "Sniper": 200
         }
         self.grid_size = 40  # Size of placement grid
+        self.turret_prefabs: dict[str, Prefab] = {}  # turret type -> prefab with its generated sprite
+        self.turret_count = 0
+        # Cells covered by turrets, resources and factories, kept current by the entity hooks
+        self.blocking_components: list[str] = ['TowerComponent', 'ResourceComponent', 'FactoryComponent']
+        self.occupancy = OccupancyGrid(self.grid_size)
+        self.occupied_cells: dict = {}  # entity -> cells it covers
+        # Preview surfaces are built once; the overlay is rebuilt only when the occupancy changes
+        self.preview_surfaces: dict[bool, pg.Surface] = {}
+        self.icon_sprites: dict[str, pg.Surface] = {}
+        self.overlay: pg.Surface | None = None
+        self.overlay_version = -1
+        for entity in self.state.entities:
+            self.on_entity_added(entity)
+
+    def on_entity_added(self, entity):
+        if not entity.has_components(['PositionComponent', 'SizeComponent']):
+            return
+        if not any(entity.has_components([component]) for component in self.blocking_components):
+            return
+        position = self.get_position(entity)
+        size = self.get_size(entity)
+        cells = self.occupancy.get_cells_for_rect(position[0], position[1], size[0], size[1])
+        self.occupied_cells[entity] = cells
+        self.occupancy.add(cells)
+
+    def on_entity_removed(self, entity):
+        cells = self.occupied_cells.pop(entity, None)
+        if cells is not None:
+            self.occupancy.remove(cells)
+
+    def on_entity_unloaded(self, entity, record_id: int):
+        # No turret can be placed on a streamed-out resource
+        cells = self.occupied_cells.pop(entity, None)
+        if cells is not None:
+            self.occupied_cells[record_id] = cells
+
+    def on_entity_restored(self, entity, record_id: int):
+        self.on_entity_removed(record_id)
+        self.on_entity_added(entity)
         
     def handle_event(self, event):
         """Handle mouse and keyboard events for turret placement"""
@@ -118,24 +161,15 @@ class TurretPlacementSystem(System):
         if y < 60:
             return False
         
-        # Check if there's already a turret at this position
-        for entity in self.state.entities:
-            if entity.has_components(['TowerComponent', 'PositionComponent']):
-                pos = self.get_position(entity)
-                size = self.get_size(entity) if entity.has_components(['SizeComponent']) else (self.grid_size, self.grid_size)
-                
-                # Check for overlap
-                if (abs(pos[0] - x) < size[0] and abs(pos[1] - y) < size[1]):
-                    return False
-        
-        return True
+        # Check if a turret, resource or factory already covers this cell
+        return self.occupancy.is_free(self.occupancy.get_cell(x, y))
     
     def place_turret(self):
         """Place the selected turret at the current mouse position"""
         if not self.placement_mode:
             return
         
-        mouse_x, mouse_y = pg.mouse.get_pos()
+        mouse_x, mouse_y = self.get_mouse_position()
         grid_x, grid_y = self.get_grid_position(mouse_x, mouse_y)
         
         # Check if placement is valid
@@ -151,22 +185,7 @@ class TurretPlacementSystem(System):
             print(f"Not enough coins! Need {cost}, have {current_coins}")
             return
         
-        # Create the turret
-        turret_count = sum(1 for e in self.state.entities if e.name.startswith("Turret"))
-        turret = Entity(f"Turret_{self.selected_turret_type}_{turret_count}")
-        
-        # Create turret sprite based on type
-        turret_sprite = self.create_turret_sprite(self.selected_turret_type)
-        
-        # Add components
-        turret.add_component(PositionComponent(x=grid_x, y=grid_y))
-        turret.add_component(SpriteComponent(sprite=turret_sprite))
-        turret.add_component(SizeComponent(width=self.grid_size, height=self.grid_size))
-        turret.add_component(TowerComponent(TowerType=self.selected_turret_type))
-        turret.add_component(HealthComponent(health=100))
-        
-        # Add to entities
-        self.state.entities.append(turret)
+        self.create_turret(self.selected_turret_type, grid_x, grid_y)
         
         # Deduct coins
         self.state.state_data["coins"] = current_coins - cost
@@ -176,6 +195,25 @@ class TurretPlacementSystem(System):
         # Exit placement mode
         self.cancel_placement()
     
+    def create_turret(self, turret_type: str, grid_x: int, grid_y: int) -> Entity:
+        """Create a turret entity at a grid-aligned position and add it to the game"""
+        turret = self.get_turret_prefab(turret_type).instantiate(f"Turret_{turret_type}_{self.turret_count}", (grid_x, grid_y))
+        self.turret_count += 1
+        
+        # Add to entities
+        self.state.add_entity(turret)
+        return turret
+    
+    def get_turret_prefab(self, turret_type: str) -> Prefab:
+        prefab = self.turret_prefabs.get(turret_type)
+        if prefab is None:
+            name = f"Turret_{turret_type}"
+            definition = PREFAB_DEFINITIONS.get(name) or get_turret_definition(turret_type)
+            prefab = Prefab.from_definition(name, definition, [self.create_turret_sprite(turret_type)],
+                                            (self.grid_size, self.grid_size))
+            self.turret_prefabs[turret_type] = prefab
+        return prefab
+    
     def create_turret_sprite(self, turret_type: str):
         """Create a sprite for the turret based on its type"""
         sprite = pg.Surface((self.grid_size, self.grid_size))
@@ -207,22 +245,15 @@ class TurretPlacementSystem(System):
         """Render placement preview and turret selection UI"""
         if self.placement_mode:
             # Draw placement preview
-            mouse_x, mouse_y = pg.mouse.get_pos()
+            mouse_x, mouse_y = self.get_mouse_position()
             grid_x, grid_y = self.get_grid_position(mouse_x, mouse_y)
             
             # Check if placement is valid
             is_valid = self.is_valid_placement(grid_x, grid_y)
             
-            # Create preview sprite
-            preview = pg.Surface((self.grid_size, self.grid_size))
-            preview.set_alpha(128)  # Semi-transparent
-            
-            if is_valid:
-                preview.fill((0, 255, 0))  # Green for valid
-            else:
-                preview.fill((255, 0, 0))  # Red for invalid
-            
-            screen.blit(preview, (grid_x, grid_y))
+            # Shade every occupied cell, then the cell under the mouse
+            screen.blit(self.get_overlay(screen), (0, 0))
+            screen.blit(self.get_preview_surface(is_valid), (grid_x, grid_y))
             
             # Draw grid lines at placement position
             pg.draw.rect(screen, (255, 255, 255) if is_valid else (255, 0, 0), 
@@ -231,6 +262,37 @@ class TurretPlacementSystem(System):
         # Draw turret selection UI at bottom of screen
         self.render_turret_selection_ui(screen)
     
+    def get_preview_surface(self, is_valid: bool) -> pg.Surface:
+        preview = self.preview_surfaces.get(is_valid)
+        if preview is None:
+            preview = pg.Surface((self.grid_size, self.grid_size))
+            preview.set_alpha(128)  # Semi-transparent
+            preview.fill((0, 255, 0) if is_valid else (255, 0, 0))  # Green for valid, red for invalid
+            self.preview_surfaces[is_valid] = preview
+        return preview
+
+    def get_overlay(self, screen) -> pg.Surface:
+        """Screen-sized layer marking occupied cells, redrawn only when the occupancy has changed"""
+        screen_size = screen.get_size()
+        if self.overlay is None or self.overlay.get_size() != screen_size or self.overlay_version != self.occupancy.version:
+            if self.overlay is None or self.overlay.get_size() != screen_size:
+                self.overlay = pg.Surface(screen_size, pg.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 0))
+            screen_rect = self.overlay.get_rect()
+            for cell_x, cell_y in self.occupancy.get_occupied_cells():
+                cell_rect = pg.Rect(cell_x * self.grid_size, cell_y * self.grid_size, self.grid_size, self.grid_size)
+                if screen_rect.colliderect(cell_rect):
+                    self.overlay.fill((255, 0, 0, 60), cell_rect)
+            self.overlay_version = self.occupancy.version
+        return self.overlay
+
+    def get_icon_sprite(self, turret_type: str, icon_size: int) -> pg.Surface:
+        icon_sprite = self.icon_sprites.get(turret_type)
+        if icon_sprite is None:
+            icon_sprite = pg.transform.scale(self.create_turret_sprite(turret_type), (icon_size, icon_size))
+            self.icon_sprites[turret_type] = icon_sprite
+        return icon_sprite
+
     def render_turret_selection_ui(self, screen):
         """Render the turret selection buttons at the bottom of the screen"""
         screen_width = screen.get_width()
@@ -282,8 +344,7 @@ class TurretPlacementSystem(System):
             icon_size = 30
             icon_x = x + (button_width - icon_size) // 2
             icon_y = y + 5
-            icon_sprite = self.create_turret_sprite(turret_type)
-            icon_sprite = pg.transform.scale(icon_sprite, (icon_size, icon_size))
+            icon_sprite = self.get_icon_sprite(turret_type, icon_size)
             screen.blit(icon_sprite, (icon_x, icon_y))
             
             # Turret name
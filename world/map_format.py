@@ -0,0 +1,149 @@
+import argparse
+import os
+import struct
+import numpy as np
+
+# File layout (little endian):
+#   header           MAGIC, version, layer count, width, height, chunk size, bytes per tile,
+#                    generator seed (-1 for maps that weren't generated from a seed; version 2 and later)
+#   chunk directory  one uint64 byte offset per chunk, chunks in row-major order
+#   chunk data       per chunk, `layer count` planes of chunk_size x chunk_size tiles; edge chunks are padded
+MAGIC = b"FGMP"
+FORMAT_VERSION = 2
+HEADER_V1 = struct.Struct("<4sHHIIHH")
+HEADER = struct.Struct("<4sHHIIHHq")
+DIRECTORY_ENTRY = struct.Struct("<Q")
+TILE_DTYPES = {1: np.uint8, 2: np.uint16}
+DEFAULT_CHUNK_SIZE = 32
+
+class MapFormatError(Exception):
+    pass
+
+def write_map(path: str, layers: list[np.ndarray], chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int | None = None):
+    """Write same-shaped 2D tile layers (layer 0 = tile types) as a chunked binary map, generated from `seed` if given"""
+    if not layers:
+        raise MapFormatError("A map needs at least one layer")
+    height, width = layers[0].shape
+    if any(layer.shape != (height, width) for layer in layers):
+        raise MapFormatError("All map layers must have the same shape")
+    max_value = max(int(layer.max()) if layer.size else 0 for layer in layers)
+    tile_bytes = 1 if max_value <= 0xFF else 2
+    dtype = TILE_DTYPES[tile_bytes]
+    chunks_x = -(-width // chunk_size)
+    chunks_y = -(-height // chunk_size)
+
+    # Pad to whole chunks and reorder to (chunk row, chunk column, layer, tile row, tile column)
+    stacked = np.zeros((len(layers), chunks_y * chunk_size, chunks_x * chunk_size), dtype=dtype)
+    for i, layer in enumerate(layers):
+        stacked[i, :height, :width] = layer
+    chunked = stacked.reshape(len(layers), chunks_y, chunk_size, chunks_x, chunk_size).transpose(1, 3, 0, 2, 4)
+
+    chunk_bytes = len(layers) * chunk_size * chunk_size * tile_bytes
+    data_offset = HEADER.size + DIRECTORY_ENTRY.size * chunks_x * chunks_y
+    directory = b"".join(DIRECTORY_ENTRY.pack(data_offset + i * chunk_bytes) for i in range(chunks_x * chunks_y))
+    # Written next to the target and renamed, so a crash never leaves a half-written map behind
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(layers), width, height, chunk_size, tile_bytes,
+                            -1 if seed is None else seed))
+        f.write(directory)
+        f.write(np.ascontiguousarray(chunked).tobytes())
+    os.replace(temp_path, path)
+
+class ChunkedMap:
+    """A binary map opened through numpy.memmap; only the chunks that are read get paged in"""
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.layer_count, self.width, self.height, self.chunk_size, tile_bytes, self.seed = read_header(f, path)
+            if tile_bytes not in TILE_DTYPES:
+                raise MapFormatError(f"{path} uses {tile_bytes}-byte tiles")
+            self.chunks_x = -(-self.width // self.chunk_size)
+            self.chunks_y = -(-self.height // self.chunk_size)
+            directory = f.read(DIRECTORY_ENTRY.size * self.chunks_x * self.chunks_y)
+        self.dtype = np.dtype(TILE_DTYPES[tile_bytes])
+        self.chunk_offsets = [offset for (offset,) in DIRECTORY_ENTRY.iter_unpack(directory)]
+        if len(self.chunk_offsets) != self.chunks_x * self.chunks_y:
+            raise MapFormatError(f"{path} has a truncated chunk directory")
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+
+    def get_chunk(self, chunk_x: int, chunk_y: int, layer: int = 0) -> np.ndarray:
+        """Read-only chunk_size x chunk_size view of one chunk layer (edge chunks include padding)"""
+        plane_bytes = self.chunk_size * self.chunk_size * self.dtype.itemsize
+        start = self.chunk_offsets[chunk_y * self.chunks_x + chunk_x] + layer * plane_bytes
+        return self.data[start:start + plane_bytes].view(self.dtype).reshape(self.chunk_size, self.chunk_size)
+
+    def get_tile(self, x: int, y: int, layer: int = 0) -> int:
+        chunk = self.get_chunk(x // self.chunk_size, y // self.chunk_size, layer)
+        return int(chunk[y % self.chunk_size, x % self.chunk_size])
+
+    def read_region(self, x: int, y: int, width: int, height: int, layer: int = 0) -> np.ndarray:
+        """Copy a tile rectangle out of the chunks it overlaps"""
+        x_end = min(x + width, self.width)
+        y_end = min(y + height, self.height)
+        x, y = max(x, 0), max(y, 0)
+        region = np.zeros((max(y_end - y, 0), max(x_end - x, 0)), dtype=self.dtype)
+        size = self.chunk_size
+        for chunk_y in range(y // size, (y_end - 1) // size + 1 if y_end > y else 0):
+            for chunk_x in range(x // size, (x_end - 1) // size + 1 if x_end > x else 0):
+                left = max(x, chunk_x * size)
+                top = max(y, chunk_y * size)
+                right = min(x_end, (chunk_x + 1) * size)
+                bottom = min(y_end, (chunk_y + 1) * size)
+                chunk = self.get_chunk(chunk_x, chunk_y, layer)
+                region[top - y:bottom - y, left - x:right - x] = \
+                    chunk[top - chunk_y * size:bottom - chunk_y * size, left - chunk_x * size:right - chunk_x * size]
+        return region
+
+    def to_array(self, layer: int = 0) -> np.ndarray:
+        return self.read_region(0, 0, self.width, self.height, layer)
+
+    def close(self):
+        # numpy unmaps once the last view is gone
+        del self.data
+
+def read_header(f, path: str) -> tuple[int, int, int, int, int, int | None]:
+    """Layer count, width, height, chunk size, bytes per tile and generator seed; leaves `f` at the chunk directory"""
+    header = f.read(HEADER_V1.size)
+    if len(header) < HEADER_V1.size:
+        raise MapFormatError(f"{path} is too short to be a map file")
+    magic, version, layer_count, width, height, chunk_size, tile_bytes = HEADER_V1.unpack(header)
+    if magic != MAGIC:
+        raise MapFormatError(f"{path} is not a map file")
+    if version == 1:
+        return layer_count, width, height, chunk_size, tile_bytes, None
+    if version != FORMAT_VERSION:
+        raise MapFormatError(f"{path} has map format version {version}, expected {FORMAT_VERSION}")
+    header += f.read(HEADER.size - HEADER_V1.size)
+    if len(header) < HEADER.size:
+        raise MapFormatError(f"{path} is too short to be a map file")
+    seed = HEADER.unpack(header)[-1]
+    return layer_count, width, height, chunk_size, tile_bytes, None if seed == -1 else seed
+
+def read_map_seed(path: str) -> int | None:
+    """The seed a map file was generated from, read from its header alone"""
+    with open(path, "rb") as f:
+        return read_header(f, path)[-1]
+
+def read_text_map(path: str) -> np.ndarray:
+    """Parse the old comma separated text map (one row per line)"""
+    with open(path, "r") as f:
+        rows = [line.strip() for line in f if line.strip()]
+    return np.array([list(map(int, row.split(','))) for row in rows], dtype=np.uint16)
+
+def convert_text_map(text_path: str, binary_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    write_map(binary_path, [read_text_map(text_path)], chunk_size)
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a text map (assets/maps/map.txt) to the binary chunked format")
+    parser.add_argument("text_path")
+    parser.add_argument("binary_path")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    convert_text_map(args.text_path, args.binary_path, args.chunk_size)
+    binary_map = ChunkedMap(args.binary_path)
+    print(f"Wrote {args.binary_path}: {binary_map.width}x{binary_map.height} tiles, "
+          f"{binary_map.chunks_x * binary_map.chunks_y} chunks of {binary_map.chunk_size}")
+
+if __name__ == "__main__":
+    main()
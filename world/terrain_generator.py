@@ -0,0 +1,104 @@
+import argparse
+import time
+import numpy as np
+from map import TILE_GRASS, TILE_DIRT, TILE_WATER, TILE_STONE
+from map import BIOME_PLAINS, BIOME_FOREST, BIOME_BARREN, BIOME_MOUNTAINS, BIOME_LAKE
+from map import OBJECT_NONE, OBJECT_TREE, OBJECT_STONE
+from world.map_format import write_map, DEFAULT_CHUNK_SIZE
+
+def smoothstep(t: np.ndarray) -> np.ndarray:
+    return t * t * (3 - 2 * t)
+
+def value_noise(width: int, height: int, scale: float, rng: np.random.Generator) -> np.ndarray:
+    """Random values on a lattice every `scale` tiles, smoothly interpolated over the whole map at once"""
+    lattice = rng.random((int(height / scale) + 2, int(width / scale) + 2), dtype=np.float32)
+    xs = np.arange(width, dtype=np.float32) / scale
+    ys = np.arange(height, dtype=np.float32) / scale
+    x0 = xs.astype(np.int32)
+    y0 = ys.astype(np.int32)
+    tx = smoothstep(xs - x0)[np.newaxis, :]
+    ty = smoothstep(ys - y0)[:, np.newaxis]
+    top = lattice[np.ix_(y0, x0)] + (lattice[np.ix_(y0, x0 + 1)] - lattice[np.ix_(y0, x0)]) * tx
+    bottom = lattice[np.ix_(y0 + 1, x0)] + (lattice[np.ix_(y0 + 1, x0 + 1)] - lattice[np.ix_(y0 + 1, x0)]) * tx
+    return top + (bottom - top) * ty
+
+def fractal_noise(width: int, height: int, scale: float, octaves: int, rng: np.random.Generator,
+                  persistence: float = 0.5) -> np.ndarray:
+    """Octaves of value noise, each twice as fine and `persistence` times as strong, normalized to 0..1"""
+    total = np.zeros((height, width), dtype=np.float32)
+    amplitude = 1.0
+    for _ in range(octaves):
+        total += value_noise(width, height, max(scale, 1.0), rng) * amplitude
+        scale /= 2
+        amplitude *= persistence
+    low, high = float(total.min()), float(total.max())
+    return (total - low) / (high - low) if high > low else np.zeros_like(total)
+
+class TerrainGenerator:
+    """Seeded procedural map: elevation and moisture noise decide biomes, tiles, and where trees and stones start"""
+    def __init__(self, seed: int | None = None, feature_scale: float = 48.0, octaves: int = 4):
+        self.seed = seed
+        self.feature_scale = feature_scale  # tiles across a typical hill or lake
+        self.octaves = octaves
+        self.water_level = 0.3
+        self.mountain_level = 0.75
+        self.dry_level = 0.35
+        self.forest_level = 0.6
+        self.start_area = (6, 6, 8)  # tile x, tile y, radius kept dry and clear around the starting units
+        # Chance per tile of an object in each biome
+        self.tree_density = {BIOME_PLAINS: 0.01, BIOME_FOREST: 0.08, BIOME_BARREN: 0.002}
+        self.stone_density = {BIOME_MOUNTAINS: 0.06, BIOME_BARREN: 0.01, BIOME_PLAINS: 0.002}
+
+    def generate(self, width: int, height: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Tile, biome and object layers, each (height, width) uint8"""
+        rng = np.random.default_rng(self.seed)
+        elevation = fractal_noise(width, height, self.feature_scale, self.octaves, rng)
+        moisture = fractal_noise(width, height, self.feature_scale * 1.5, self.octaves, rng)
+
+        start_x, start_y, start_radius = self.start_area
+        ys, xs = np.ogrid[:height, :width]
+        start_mask = (xs - start_x) ** 2 + (ys - start_y) ** 2 <= start_radius ** 2
+        elevation[start_mask] = np.maximum(elevation[start_mask], self.water_level + 0.05)
+
+        biomes = np.full((height, width), BIOME_PLAINS, dtype=np.uint8)
+        biomes[moisture >= self.forest_level] = BIOME_FOREST
+        biomes[moisture < self.dry_level] = BIOME_BARREN
+        biomes[elevation >= self.mountain_level] = BIOME_MOUNTAINS
+        biomes[elevation < self.water_level] = BIOME_LAKE
+
+        tiles = np.full((height, width), TILE_GRASS, dtype=np.uint8)
+        tiles[biomes == BIOME_BARREN] = TILE_DIRT
+        tiles[biomes == BIOME_MOUNTAINS] = TILE_STONE
+        tiles[biomes == BIOME_LAKE] = TILE_WATER
+
+        objects = np.full((height, width), OBJECT_NONE, dtype=np.uint8)
+        roll = rng.random((height, width), dtype=np.float32)
+        tree_chance = np.zeros((height, width), dtype=np.float32)
+        stone_chance = np.zeros((height, width), dtype=np.float32)
+        for biome, density in self.tree_density.items():
+            tree_chance[biomes == biome] = density
+        for biome, density in self.stone_density.items():
+            stone_chance[biomes == biome] = density
+        # One roll per tile: the low end of the range is a tree, the next slice a stone
+        objects[roll < tree_chance] = OBJECT_TREE
+        objects[(roll >= tree_chance) & (roll < tree_chance + stone_chance)] = OBJECT_STONE
+        objects[start_mask] = OBJECT_NONE
+        return tiles, biomes, objects
+
+    def generate_file(self, path: str, width: int, height: int, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        write_map(path, list(self.generate(width, height)), chunk_size, self.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a binary map (tiles, biomes and objects)")
+    parser.add_argument("path", nargs="?", default="assets/maps/map.bin")
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    TerrainGenerator(args.seed).generate_file(args.path, args.width, args.height, args.chunk_size)
+    print(f"Generated {args.width}x{args.height} map in {time.perf_counter() - start:.3f}s: {args.path}")
+
+if __name__ == "__main__":
+    main()